@@ -0,0 +1,239 @@
+""" This is the 'bitboards' module that holds the square layout and the precomputed attack tables used by the engine's
+move generator. A bitboard is a plain 81-bit integer where bit (rank * 9 + file) stands for board[rank][file]. """
+
+from constants import *
+
+
+""" SQUARES. """
+SQUARES = 81
+FULL_BB = (1 << SQUARES) - 1
+SQUARE_BB = [1 << sq for sq in range(SQUARES)]
+
+RANK_BB = [sum(SQUARE_BB[rank * 9 + file] for file in range(9)) for rank in range(9)]
+FILE_BB = [sum(SQUARE_BB[rank * 9 + file] for rank in range(9)) for file in range(9)]
+
+
+def square(rank: int, file: int) -> int:
+    """ This function returns the square index of a rank and file within the board array. """
+
+    return rank * 9 + file
+
+
+def square_bits(bitboard: int) -> list[int]:
+    """ This function returns the square index of every set bit in a bitboard. """
+
+    squares = []
+    while bitboard:
+        lsb = bitboard & -bitboard
+        squares.append(lsb.bit_length() - 1)
+        bitboard ^= lsb
+
+    return squares
+
+
+""" PROMOTION ZONES. """
+# Sente promotes within ranks 0-2 and gote within ranks 6-8
+PROMOTION_ZONE = [RANK_BB[0] | RANK_BB[1] | RANK_BB[2], RANK_BB[6] | RANK_BB[7] | RANK_BB[8]]
+
+# Squares a piece can never move to without promoting, since it would have no moves left afterwards
+DEAD_SQUARES = [[0] * PIECE_TYPES for _ in PLAYERS]
+DEAD_SQUARES[SENTE][PAWN] = DEAD_SQUARES[SENTE][LANCE] = RANK_BB[0]
+DEAD_SQUARES[SENTE][KNIGHT] = RANK_BB[0] | RANK_BB[1]
+DEAD_SQUARES[GOTE][PAWN] = DEAD_SQUARES[GOTE][LANCE] = RANK_BB[8]
+DEAD_SQUARES[GOTE][KNIGHT] = RANK_BB[8] | RANK_BB[7]
+
+# Files a pawn may not be dropped on, indexed by a 9-bit mask of the files already holding a pawn of the same player
+NIFU_FILES = [sum(FILE_BB[file] for file in range(9) if files >> file & 1) for files in range(1 << 9)]
+
+
+""" STEP ATTACKS. """
+# Directions are (rank, file) offsets written from sente's point of view, gote's are mirrored on the rank
+GOLD_STEPS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, 0))
+SILVER_STEPS = ((-1, -1), (-1, 0), (-1, 1), (1, -1), (1, 1))
+KING_STEPS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+KNIGHT_STEPS = ((-2, -1), (-2, 1))
+PAWN_STEPS = ((-1, 0),)
+
+ROOK_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+BISHOP_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+PIECE_STEPS = {
+    PAWN: PAWN_STEPS, KNIGHT: KNIGHT_STEPS, SILVER: SILVER_STEPS, GOLD: GOLD_STEPS, KING: KING_STEPS,
+    PRO_PAWN: GOLD_STEPS, PRO_LANCE: GOLD_STEPS, PRO_KNIGHT: GOLD_STEPS, PRO_SILVER: GOLD_STEPS,
+    HORSE: ROOK_DIRECTIONS, DRAGON: BISHOP_DIRECTIONS  # The one square steps a promoted slider gains
+}
+
+SLIDERS = (LANCE, BISHOP, ROOK, HORSE, DRAGON)
+
+
+def step_attacks(sq: int, steps: tuple, player: int) -> int:
+    """ This function returns the bitboard of squares reached by single steps from a square. """
+
+    rank, file = divmod(sq, 9)
+    direction = 1 if player == SENTE else -1
+    attacks = 0
+
+    for step_rank, step_file in steps:
+        to_rank, to_file = rank + step_rank * direction, file + step_file
+
+        # Steps that leave the board are skipped
+        if 0 <= to_rank < 9 and 0 <= to_file < 9:
+            attacks |= SQUARE_BB[to_rank * 9 + to_file]
+
+    return attacks
+
+
+def ray_attacks(sq: int, directions: tuple, occupied: int) -> int:
+    """ This function walks each ray from a square and returns the squares reached before (and including) a blocker. """
+
+    rank, file = divmod(sq, 9)
+    attacks = 0
+
+    for step_rank, step_file in directions:
+        to_rank, to_file = rank + step_rank, file + step_file
+
+        while 0 <= to_rank < 9 and 0 <= to_file < 9:
+            bit = SQUARE_BB[to_rank * 9 + to_file]
+            attacks |= bit
+
+            # The ray stops on the first occupied square
+            if occupied & bit:
+                break
+
+            to_rank, to_file = to_rank + step_rank, to_file + step_file
+
+    return attacks
+
+
+# STEP_ATTACKS[player][piece][square] holds the attack bitboard of every non-sliding move
+STEP_ATTACKS = [[[0] * SQUARES for _ in range(PIECE_TYPES)] for _ in PLAYERS]
+
+for _player in (SENTE, GOTE):
+    for _piece, _steps in PIECE_STEPS.items():
+        for _sq in range(SQUARES):
+            STEP_ATTACKS[_player][_piece][_sq] = step_attacks(_sq, _steps, _player)
+
+
+""" SLIDING ATTACKS. """
+# Each line kind (ranks, files, diagonals and anti-diagonals) gets its own rotated layout in which every line's squares
+# sit in consecutive bits, so the occupancy of the squares between a line's two ends is a single shift and mask
+RANK_LINE, FILE_LINE, DIAG_LINE, ANTI_LINE = 0, 1, 2, 3
+
+LINES = [
+    [[rank * 9 + file for file in range(9)] for rank in range(9)],
+    [[rank * 9 + file for rank in range(9)] for file in range(9)],
+    [[rank * 9 + rank - diff for rank in range(9) if 0 <= rank - diff < 9] for diff in range(-8, 9)],
+    [[rank * 9 + total - rank for rank in range(9) if 0 <= total - rank < 9] for total in range(17)]
+]
+
+LINE_BB = [[0] * SQUARES for _ in LINES]  # Bit of each square within a rotated layout
+LINE_SHIFT = [[0] * SQUARES for _ in LINES]  # Shift that brings a square's inner line occupancy down to bit 0
+LINE_MASK = [[0] * SQUARES for _ in LINES]  # Mask covering a square's inner line occupancy
+LINE_ATTACKS = [[None] * SQUARES for _ in LINES]  # Attack bitboard indexed by square then inner line occupancy
+
+
+def line_attacks(line: list[int], idx: int, pattern: int) -> int:
+    """ This function returns the squares reached along a line from one of its squares for an inner occupancy. """
+
+    attacks = 0
+
+    for step in (-1, 1):
+        to_idx = idx + step
+
+        while 0 <= to_idx < len(line):
+            attacks |= SQUARE_BB[line[to_idx]]
+
+            # Only the inner squares of a line can block, the end squares are always reachable
+            if 0 < to_idx < len(line) - 1 and pattern >> (to_idx - 1) & 1:
+                break
+
+            to_idx += step
+
+    return attacks
+
+
+for _kind, _lines in enumerate(LINES):
+    _offset = 0
+
+    for _line in _lines:
+        _inner = max(len(_line) - 2, 0)
+
+        for _idx, _sq in enumerate(_line):
+            LINE_BB[_kind][_sq] = 1 << (_offset + _idx)
+            LINE_SHIFT[_kind][_sq] = _offset + 1
+            LINE_MASK[_kind][_sq] = (1 << _inner) - 1
+            LINE_ATTACKS[_kind][_sq] = [line_attacks(_line, _idx, _pattern) for _pattern in range(1 << _inner)]
+
+        _offset += len(_line)
+
+
+# A lance only slides forwards, so its table is the file table cut down to the squares in front of it
+FORWARD_BB = [[0] * SQUARES for _ in PLAYERS]
+
+for _sq in range(SQUARES):
+    _rank, _file = divmod(_sq, 9)
+    FORWARD_BB[SENTE][_sq] = sum(SQUARE_BB[_to_rank * 9 + _file] for _to_rank in range(_rank))
+    FORWARD_BB[GOTE][_sq] = sum(SQUARE_BB[_to_rank * 9 + _file] for _to_rank in range(_rank + 1, 9))
+
+LANCE_ATTACKS = [[[attacks & FORWARD_BB[_player][_sq] for attacks in LINE_ATTACKS[FILE_LINE][_sq]]
+                  for _sq in range(SQUARES)] for _player in (SENTE, GOTE)]
+
+
+def slider_attacks(player: int, piece: int, sq: int, lines: list[int]) -> int:
+    """ This function looks up the attack bitboard of a sliding piece from the occupancy of each rotated layout. """
+
+    if piece == LANCE:
+        return LANCE_ATTACKS[player][sq][lines[FILE_LINE] >> LINE_SHIFT[FILE_LINE][sq] & 0x7F]
+
+    if piece == BISHOP or piece == HORSE:
+        attacks = (LINE_ATTACKS[DIAG_LINE][sq][lines[DIAG_LINE] >> LINE_SHIFT[DIAG_LINE][sq] & LINE_MASK[DIAG_LINE][sq]]
+                   | LINE_ATTACKS[ANTI_LINE][sq][lines[ANTI_LINE] >> LINE_SHIFT[ANTI_LINE][sq] & LINE_MASK[ANTI_LINE][sq]])
+
+    else:  # Rook or dragon
+        attacks = (LINE_ATTACKS[RANK_LINE][sq][lines[RANK_LINE] >> LINE_SHIFT[RANK_LINE][sq] & 0x7F]
+                   | LINE_ATTACKS[FILE_LINE][sq][lines[FILE_LINE] >> LINE_SHIFT[FILE_LINE][sq] & 0x7F])
+
+    # Promoted sliders also step one square in the directions their ray does not cover
+    if piece > KING:
+        attacks |= STEP_ATTACKS[player][piece][sq]
+
+    return attacks
+
+
+""" LINES BETWEEN SQUARES. """
+# BETWEEN_BB[a][b] holds the squares strictly between two squares on a shared rank, file or diagonal, else nothing
+BETWEEN_BB = [[0] * SQUARES for _ in range(SQUARES)]
+
+for _sq in range(SQUARES):
+    for _direction in ROOK_DIRECTIONS + BISHOP_DIRECTIONS:
+        _rank, _file = divmod(_sq, 9)
+        _between = 0
+
+        while True:
+            _rank, _file = _rank + _direction[0], _file + _direction[1]
+            if not (0 <= _rank < 9 and 0 <= _file < 9):
+                break
+
+            BETWEEN_BB[_sq][_rank * 9 + _file] = _between
+            _between |= SQUARE_BB[_rank * 9 + _file]
+
+
+def rotate(occupied: int) -> list[int]:
+    """ This function builds the occupancy of every rotated layout from a plain occupancy bitboard. """
+
+    lines = [0, 0, 0, 0]
+
+    for sq in square_bits(occupied):
+        for kind in range(len(LINES)):
+            lines[kind] |= LINE_BB[kind][sq]
+
+    return lines
+
+
+def attacks_from(player: int, piece: int, sq: int, lines: list[int]) -> int:
+    """ This function returns the attack bitboard of any piece standing on a square. """
+
+    if piece in SLIDERS:
+        return slider_attacks(player, piece, sq, lines)
+
+    return STEP_ATTACKS[player][piece][sq]
@@ -0,0 +1,238 @@
+""" This is the 'client' module, the pygame front-end that sits on top of the headless rules core. It draws the board,
+pieces and komadai, plays the sound effects and asks the user about promotions. """
+
+import pygame as game
+
+from assets import *
+from interface import PromotionWindow
+from mechanics import InitializeGame
+
+promotion_menu = PromotionWindow()
+
+
+class GameClient(InitializeGame):
+
+    def __init__(self, ranks = 9, files = 9) -> None:
+        super().__init__(ranks = ranks, files = files)
+        
+        self.sounds = {'move': MOVE_SFX, 'capture': CAPTURE_SFX, 'check': KING_IN_CHECK_SFX, 'low_time': LOW_TIME_SFX,
+                       'period': PERIOD_SFX, 'game_over': GAME_OVER_SFX}
+
+
+    def play_sound(self, sound: str) -> None:
+        """ This function plays one of the game's sound effects. """
+
+        self.sounds[sound].play()
+
+
+    def stop_sound(self, sound: str) -> None:
+        """ This function stops one of the game's sound effects. """
+
+        self.sounds[sound].stop()
+
+
+    def choose_promotion(self, piece) -> bool:
+        """ This function renders the promotion window to ask the player if they would like to promote their piece. """
+
+        promotion_menu.promotion_window(piece)
+        return promotion_menu.promoted
+
+
+    def display_pieces_on_board(self, moves) -> None:
+        """ This function loops through the ranks and files, and draws the pieces in their assigned locations. """
+
+        for x in range(self.ranks):
+            for y in range(self.files):
+                if self.board[x][y] != 0:  # Checks if there is a class object assigned in that location
+                    self.display_piece_imgs(self.board[x][y])
+        
+        players = ["sente", "gote"]
+        
+        for player in players:
+            # For every piece type the komadai holds at least one of
+            for index, code in enumerate(HAND_TYPES):
+                if self.captured_pieces[player][code] > 0:
+                    capture = PIECE_NAMES[code]
+
+                    match player:
+                        case 'sente':
+                            piece, position = self.get_sente(88, capture, 61)
+
+                        case 'gote':
+                            piece, position = self.get_gote(220, capture, 61) 
+                    
+                    # Draws captured piece onto the komadai, highlighted if the player to move has selected it
+                    selected = player == self.current_player and self.captured_select[index] is True
+                    self.display_captured_pieces(selected, player, piece, position, moves)
+    
+                        
+    def get_sente(self, base: int, capture: str, offset: int) -> str and int:
+        """ This function returns the pixel location of a certain captured piece. """
+        
+        match capture:
+            case 'Pawn':
+                piece = SENTE_PIECE_IMGS[7]
+                base += (6*offset)
+            
+            case 'Lance':
+                piece = SENTE_PIECE_IMGS[4]
+                base += (5*offset)
+            
+            case 'Silver General':
+                piece = SENTE_PIECE_IMGS[2]
+                base += (3*offset)
+            
+            case 'Gold General':
+                piece = SENTE_PIECE_IMGS[1]
+                base += (2*offset)
+            
+            case 'Rook':
+                piece = SENTE_PIECE_IMGS[5]
+            
+            case 'Knight':
+                piece = SENTE_PIECE_IMGS[3]
+                base += (4*offset)
+            
+            case 'Bishop':
+                piece = SENTE_PIECE_IMGS[6]
+                base += (1*offset)
+        
+        return piece, (int(S_KOMA_X) + 5, base)
+                
+                
+    def get_gote(self, base: int, capture: str, offset: int) -> str and int:
+        """ This function returns the pixel location of a certain captured piece. """
+        
+        match capture:
+            case 'Pawn':
+                piece = GOTE_PIECE_IMGS[7]
+                
+            case 'Lance':
+                piece = GOTE_PIECE_IMGS[4]
+                base += (1*offset)
+            
+            case 'Silver General':
+                piece = GOTE_PIECE_IMGS[2]
+                base += (3*offset)
+            
+            case 'Gold General':
+                piece = GOTE_PIECE_IMGS[1]
+                base += (4*offset)
+            
+            case 'Rook':
+                piece = GOTE_PIECE_IMGS[5]
+                base += (6*offset)
+            
+            case 'Knight':
+                piece = GOTE_PIECE_IMGS[3]
+                base += (2*offset)
+            
+            case 'Bishop':
+                piece = GOTE_PIECE_IMGS[6]
+                base += (5*offset)
+                
+        return piece, (int(G_KOMA_X) + 5, base)
+
+
+    @staticmethod
+    def piece_position(piece) -> int:
+        """ This function creates and returns the [x] and [y] positions of a piece within the board.  """
+
+        piece_x = int(BOARD_X + (piece.file * BOARD_TILE_SIZE)) + 5
+        piece_y = int(BOARD_Y + (piece.rank * BOARD_TILE_SIZE)) + 2
+
+        return piece_x, piece_y
+
+
+    def display_piece_imgs(self, piece) -> None:
+        """ This function displays each player's piece. """
+
+        match piece.player:
+            case 'sente':
+                if piece.token_promoted is True:
+                    img = PROMOTED_SENTE[piece.promoted_pc_idx]  # Draws the promotion piece for sente
+                else:
+                    img = SENTE_PIECE_IMGS[piece.pc_idx]  # Draws the default piece for sente
+
+            case 'gote':
+                if piece.token_promoted is True:
+                    img = PROMOTED_GOTE[piece.promoted_pc_idx]  # Draws the promotion piece for gote
+                else:
+                    img = GOTE_PIECE_IMGS[piece.pc_idx]  # Draws the default piece for gote
+        
+        self.draw_selection_attributes(piece)
+        GAME_DISPLAY.blit(img, (self.piece_position(piece)))
+
+
+    def display_captured_pieces(self, selected: bool, player: str, piece, position, moves) -> None:
+        """ This function draws a piece type held on a komadai and highlights it if it has been selected. """
+        
+        if selected and player == 'gote':
+            game.draw.rect(GAME_DISPLAY, GREY, (position[0] - 4, position[1] - 3, 60, 60), 0)
+            self.draw_drop_moves(moves)
+        
+        elif selected and player == 'sente':
+            game.draw.rect(GAME_DISPLAY, GREY, (position[0] - 4, position[1] - 1, 60, 60), 0)
+            self.draw_drop_moves(moves)
+            
+        GAME_DISPLAY.blit(piece, position)
+
+    
+    def draw_drop_moves(self, moves) -> None:
+        """ This function draws all the valid drop spaces for a captured piece. """
+        
+        for move in moves:
+
+            legal_x_pos = int(BOARD_X + (move[1] * BOARD_TILE_SIZE)) + 1
+            legal_y_pos = int(BOARD_Y + (move[0] * BOARD_TILE_SIZE)) + 1
+
+            game.draw.rect(GAME_DISPLAY, GREY, (int(legal_x_pos), int(legal_y_pos), 60, 60), 0)   
+             
+
+    def draw_legal_moves(self, piece) -> None:
+        """ This function draws the legal moves of a selected piece. """
+
+        board = self.board
+        draw_moves, capture_move = self.legal_move_list(piece.rank, piece.file)
+        
+        for i in capture_move:
+            capture_x = i[1]
+            capture_y = i[0]
+
+            # If a space contains an enemy space, they are indicated with a highlight
+            if (board[capture_y][capture_x] != 0 and (capture_x, capture_y) in draw_moves
+                    and board[capture_y][capture_x].player != piece.player):
+                
+                capture_x_pos = int(BOARD_X + (capture_x * BOARD_TILE_SIZE)) + 1
+                capture_y_pos = int(BOARD_Y + (capture_y * BOARD_TILE_SIZE)) + 1
+
+                # Legal moves that are on an enemy piece are removed and replaced with a capture indicator
+                draw_moves.remove((capture_x, capture_y))
+                game.draw.rect(GAME_DISPLAY, GREEN, (int(capture_x_pos), int(capture_y_pos), 60, 60), 1)
+
+        for j in draw_moves:
+
+            legal_x_pos = int(BOARD_X + (j[0] * BOARD_TILE_SIZE)) + 1
+            legal_y_pos = int(BOARD_Y + (j[1] * BOARD_TILE_SIZE)) + 1
+
+            # Legal moves on empty spaces are displayed
+            game.draw.rect(GAME_DISPLAY, GREY, (int(legal_x_pos), int(legal_y_pos), 60, 60), 0)        
+
+
+    def draw_selection_attributes(self, piece) -> None:
+        """ This function highlights any selected piece and draws their legal moves. """
+        
+        piece_x, piece_y = self.piece_position(piece)
+
+        match (piece.rank, piece.file) == self.selected_square:
+            case True:                
+                game.draw.rect(
+                    GAME_DISPLAY, GREY, (piece_x - 4, piece_y - 1, 60, 60), 0
+                    )   # Draws a square on under a piece to indicate it has been selected
+                self.draw_legal_moves(piece)
+        
+        match (piece.rank, piece.file) == self.checked_king:
+            case True:
+                game.draw.rect(
+                    GAME_DISPLAY, RED, (piece_x - 4, piece_y - 1, 60, 60), 1
+                    )    # Draws a red highlight over the king piece that is in check
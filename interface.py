@@ -9,7 +9,7 @@ import pygame as game
 
 from time import sleep
 from pygame import *
-from constants import *
+from assets import *
 
 
 # This class handles all the methods surrounding music/audio
@@ -286,6 +286,56 @@ class GameAttributes:
                                            (GAME_WIDTH / 2 - 30, GAME_HEIGHT / 2 + 260))
    
        
+    def choose_opponent(self, main_menu, main, mechanics) -> None:
+        """ This function displays the window where the user selects whether to play the engine or another player. """
+    
+        running = True
+        while running:
+        
+            GAME_DISPLAY.blit(TITLE_SCREENS[1], (0, 0))
+
+            # Displays text that asks the user to choose their opponent
+            opponent = GAME_FONT_1.render('CHOOSE YOUR OPPONENT!', 1, LIGHT_WHITE)
+            GAME_DISPLAY.blit(opponent, (GAME_WIDTH / 2 - 280, GAME_HEIGHT / 2 - 190))
+            
+            # Function call to render buttons on window
+            self.engine_button.draw_button()
+            self.player_button.draw_button()
+            self.prev_scene_button.draw_button()
+                                    
+            for event in game.event.get():
+                                                
+                if event.type == QUIT:
+                    game.quit()
+                    sys.exit()
+                
+                # If the user selects the 'engine' button, the computer plays the other colour
+                self.engine_button.check_input()
+                if self.engine_button.clicked and event.type == game.MOUSEBUTTONDOWN:
+                    mechanics.engine = True
+                    UI_CLICK_SFX.play()
+                    self.choose_player(main_menu, main, mechanics)
+                
+                # If the user selects the 'player' button, both colours are played locally
+                self.player_button.check_input()
+                if self.player_button.clicked and event.type == game.MOUSEBUTTONDOWN:
+                    mechanics.engine = False
+                    UI_CLICK_SFX.play()
+                    self.choose_player(main_menu, main, mechanics)
+
+                # If the return button was clicked, the user will be redirected to the main menu
+                self.prev_scene_button.check_input()
+                if self.prev_scene_button.clicked is True and event.type == game.MOUSEBUTTONDOWN:
+                    self.prev_scene_button.clicked = not self.prev_scene_button.clicked
+                    running = False
+                    UI_CLICK_SFX.play()
+                    main_menu()
+                                        
+            game.display.update()
+                        
+            GAME_CLOCK.tick(FPS)
+
+
     def choose_player(self, main_menu, main, mechanics) -> None:
         """ This function displays the window where the user selects what colour they want to play as. """
     
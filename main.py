@@ -9,15 +9,15 @@ import pygame as game
 from pygame import *
 from time import sleep
 
-from constants import *
+from assets import *
 from interface import GameAttributes, MusicManager, MenuButtonsUI, ManualMenuUI, OptionMenuUI, CreditsMenuUI, GameOverUI
-from mechanics import InitializeGame
+from client import GameClient
 
 os.environ['SDL_VIDEO_CENTERED'] = '1'  # centers game window
 game.init()
 
 # All the system classes that make up the game
-game_mechanics = InitializeGame()
+game_mechanics = GameClient()
 system = [MusicManager(), ManualMenuUI(), OptionMenuUI(), CreditsMenuUI(), GameOverUI(), GameAttributes()] 
 
 
@@ -104,6 +104,17 @@ class GameWindow:
         if game_mechanics.gote_byoyomi_period is True:
             GAME_DISPLAY.blit(byoyomi_txt, (GAME_WIDTH / 2 - 415, GAME_HEIGHT / 2 - 298))
 
+        # Displays the engine's principal variation next to its timer, one move per line
+        if game_mechanics.engine is True:
+            for line, pv_move in enumerate(game_mechanics.engine_pv[:PV_DISPLAY_MOVES]):
+                pv_txt = BYOYOMI_FONT.render(pv_move, 1, LIGHT_WHITE)
+
+                # Below gote's timer at the top, or above sente's timer at the bottom
+                if game_mechanics.user == 'sente':
+                    GAME_DISPLAY.blit(pv_txt, (GAME_WIDTH / 2 - 407, GAME_HEIGHT / 2 - 230 + line * 18))
+                else:
+                    GAME_DISPLAY.blit(pv_txt, (GAME_WIDTH / 2 + 352, GAME_HEIGHT / 2 + 170 + line * 18))
+
 
 
 class GameLoop:
@@ -215,9 +226,8 @@ class GameLoop:
 
         while running:
 
-            # Makes it wear AI makes the first turn if the user is gote and/or makes sente the starting player
-            if game_mechanics.starting_move and (game_mechanics.engine is True or 
-                                                 (game_mechanics.engine is False and game_mechanics.user == 'gote')):
+            # Makes gote the starting player if the user is gote in a local game, against the engine sente always starts
+            if game_mechanics.starting_move and game_mechanics.engine is False and game_mechanics.user == 'gote':
                 game_mechanics.starting_move = False
                 game_mechanics.change_player_turns()
             
@@ -232,10 +242,6 @@ class GameLoop:
             GameWindow().update_game_window(sente_time, gote_time)
             self.input_controller()
 
-            # If king is in check, keep checking for checkmate
-            if game_mechanics.king_in_check():
-                game_mechanics.validate_checkmate()
-
             # If the game is finished, the board is reset
             if game_mechanics.game_over is True:
                 game_mechanics.reset_board_status()
@@ -245,6 +251,11 @@ class GameLoop:
             game.display.update()
             GAME_CLOCK.tick(FPS)
 
+            # Once the user's move has been drawn, the engine plays its reply if it is playing the other colour
+            game_mechanics.engine_turn = game_mechanics.engine and game_mechanics.current_player != game_mechanics.user
+            if game_mechanics.engine_turn and game_mechanics.game_over is False:
+                game_mechanics.play_engine_move()
+
         
 class MenuScreen(GameWindow, GameLoop):
     
@@ -316,7 +327,7 @@ class MenuScreen(GameWindow, GameLoop):
             self.start_button.check_input()
             if self.start_button.clicked and event.type == game.MOUSEBUTTONDOWN:
                 UI_CLICK_SFX.play()                
-                system[5].choose_player(self.main_menu, self.main, game_mechanics)
+                system[5].choose_opponent(self.main_menu, self.main, game_mechanics)
                                     
             # If the 'manual' button is selected, then instructions that tell the user how to play, is displayed
             self.manual_button.check_input()
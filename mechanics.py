@@ -1,13 +1,16 @@
-""" This is the 'board' module in which most of the game logic and mechanics are handled. """
+""" This is the 'board' module in which most of the game logic and mechanics are handled. Sounds and the promotion
+dialog are reached through hooks that the pygame client overrides, so the rules here run without a display. """
 
 
-import itertools
+import time
+from bitboards import square_bits
 from board import Board
 from constants import *
 from pieces import *
-
-from interface import PromotionWindow
-promotion_menu = PromotionWindow()
+from position import Position, encode_move, encode_drop, is_drop, drop_piece, is_promotion, move_from, move_to, usi_notation
+from search import Search, allocate_time
+from parallel import ParallelSearch
+from tsume import TsumeSolver
 
 
 class GameMechanics(Board):
@@ -17,6 +20,11 @@ class GameMechanics(Board):
         self.current_player = 'sente'
         self.user = ''
         self.engine = False
+        self.engine_turn = False
+        self.engine_search = None  # Created the first time the engine has to move
+        self.engine_pv = []  # The engine's expected line from its last search, in USI notation
+        self.selected_square = None  # (rank, file) of the board piece the user has selected
+        self.checked_king = None  # (rank, file) of the king to move while it is in check
         self.start_game = True
         self.starting_move = True
         self.sente_move_made = False
@@ -39,16 +47,57 @@ class GameMechanics(Board):
         self.reason_for_win = ''
                     
 
-    def piece_movement(self, start_position, end_position) -> bool:
-        """ This function handles piece movement within the board array. """
-        
-        # Checks to see if a move has been made during the main byoyomi period
+    def generate_board_status(self) -> None:
+        """ This function sets up the starting board along with the engine position that mirrors it. """
+
+        super().generate_board_status()
+        self.position = Position.from_board(self.board, self.captured_pieces)
+
+
+    def position_key(self) -> int:
+        """ This function returns the Zobrist key that identifies the current board, komadai and player to move. """
+
+        return self.position.key
+
+
+    def play_sound(self, sound: str) -> None:
+        """ This function is a hook for playing a sound effect, the rules core is silent and the client overrides it. """
+
+
+    def stop_sound(self, sound: str) -> None:
+        """ This function is a hook for stopping a sound effect, the rules core is silent and the client overrides it. """
+
+
+    def choose_promotion(self, piece) -> bool:
+        """ This function is a hook that decides an optional promotion, headless games always promote. """
+
+        return True
+
+
+    def record_byoyomi_move(self) -> None:
+        """ This function marks that a move has been made during the byoyomi period, so the period is reset. Board
+            moves and drops, by the user or the engine, all call it. """
+
         if self.sente_initial_byoyomi is False:
             self.sente_move_made = True
 
         if self.gote_initial_byoyomi is False:
             self.gote_move_made = True
 
+
+    def piece_movement(self, start_position, end_position, promote: bool = None) -> bool:
+        """ This function handles piece movement within the board array. The engine passes its promotion choice in
+            'promote', otherwise the usual promotion rules and dialog decide. """
+        
+        move = encode_move(start_position[0] * 9 + start_position[1], end_position[0] * 9 + end_position[1])
+
+        # Moves that put the king in check or leave the king in check are rejected before the board is touched
+        if not self.position.is_legal(move):
+            self.stop_sound('move')
+            return False
+
+        self.record_byoyomi_move()
+
         current_piece_position = self.board[start_position[0]][start_position[1]]  # Current piece selected
         reset_current_piece_position = 0 
                           
@@ -61,25 +110,33 @@ class GameMechanics(Board):
             self.start_timer = True
             self.starting_move = False
         
-        # If the current piece moves to a space with an enemy piece, it will be captured and pushed onto the komadai stack
+        # If the current piece moves to a space with an enemy piece, it is captured and counted on the komadai
         if (self.board[end_position[0]][end_position[1]] != 0 and 
             self.board[end_position[0]][end_position[1]].player != self.current_player and
             str(self.board[end_position[0]][end_position[1]]) != 'King'):
         
-            new_capture = self.board[end_position[0]][end_position[1]]            
-            new_capture.player = self.current_player
-            self.captured_pieces.get(self.current_player).get(str(new_capture)).append(new_capture)
+            new_capture = self.board[end_position[0]][end_position[1]]
+            self.captured_pieces[self.current_player][PIECE_CODES[str(new_capture)]] += 1
             
-            CAPTURE_SFX.play()
+            self.play_sound('capture')
                                
-        self.check_for_piece_promotion(start_position, end_position) # Function call to check if a piece can be promoted
+        was_promoted = current_piece_position.token_promoted
+
+        if promote is None:
+            self.check_for_piece_promotion(start_position, end_position) # Function call to check if a piece can be promoted
+
+        elif promote:
+            current_piece_position.token_promoted = True
+            current_piece_position.promotion_status = True
+            current_piece_position.unpromotable_token = True
 
         self.board[end_position[0]][end_position[1]] = current_piece_position
         self.board[start_position[0]][start_position[1]] = reset_current_piece_position  # Resets that pieces old position to 0
 
-        # Filter moves that can be made when a king is in check
-        valid_moves = self.filter_valid_moves(start_position, end_position)
-        return valid_moves is not False
+        # The engine position plays the same move, promoting if the piece was promoted on this move
+        self.position.make_move(encode_move(start_position[0] * 9 + start_position[1], end_position[0] * 9 + end_position[1],
+                                            current_piece_position.token_promoted and not was_promoted))
+        return True
     
     
     def contains(self, stack: list, value: int) -> bool:
@@ -88,11 +145,23 @@ class GameMechanics(Board):
         return value in stack
     
     
-    def valid_drop(self) -> bool:
-        """ This function returns all valid spaces a piece can be dropped on. """
-        
-        # loops through each space on the board, and finds an empty spot
-        return [(x, y) for x, y in itertools.product(range(self.ranks), range(self.files)) if self.board[x][y] == 0]
+    def valid_drop(self) -> list[tuple]:
+        """ This function returns the (rank, file) squares the piece selected on the komadai can legally be dropped
+            on, or nothing when no piece is selected. """
+
+        if not self.contains(self.captured_select, True):
+            return []
+
+        # The komadai stacks follow the order of the hand piece codes
+        piece = HAND_TYPES[self.captured_select.index(True)]
+        position = self.position
+
+        if position.hands[position.side][piece] == 0:
+            return []
+
+        # In check a drop has to block, and the drop rules (nifu, dead ranks, uchifuzume) come from the generator
+        empty = position.evasion_masks()[1] & ~(position.occupied[SENTE] | position.occupied[GOTE])
+        return [divmod(sq, 9) for sq in square_bits(position.drop_targets(piece, empty))]
 
     
     def reset_koma_selection(self, rank, pieces) -> None:
@@ -104,9 +173,8 @@ class GameMechanics(Board):
                 continue    
             
             # For every piece, reset there selection, then break out of loop
-            if self.captured_select[i]:
-                character = pieces[i]
-                self.captured_pieces[self.current_player][character][0].koma_selected = False
+            if self.captured_select[i] is True:
+                self.captured_select[i] = False
                 break
         
                         
@@ -121,21 +189,27 @@ class GameMechanics(Board):
             select = self.captured_select.index(True)
             piece = pieces[select]
             
-            # If the move is valid, the piece is popped out of the stack                         
+            drop = encode_drop(PIECE_CODES[piece], rank * 9 + file)
+
+            # If the drop is legal, the piece is taken off the komadai count
             if (rank, file) in self.valid_drop():
-                self.captured_pieces[self.current_player][piece][0].koma_selected = False                    
-                piece_draw = self.captured_pieces[self.current_player][piece].pop()
+                self.captured_pieces[self.current_player][PIECE_CODES[piece]] -= 1
+                self.record_byoyomi_move()
 
-                # Removed piece is placed back onto board
-                self.board[rank][file] = piece_draw
-                piece_draw.rank, piece_draw.file = rank, file
-                MOVE_SFX.play()
-                
-                self.validate_checkmate()
+                # A fresh, unpromoted piece object is placed back onto the board
+                self.board[rank][file] = self.hand_pieces[PIECE_CODES[piece]](rank, file, self.current_player)
+                self.position.make_move(drop)
+                self.play_sound('move')
 
                 # Komadai selection is reset
                 self.captured_select[select] = False
                 self.change_player_turns() 
+
+                if self.king_in_check():
+                    self.stop_sound('move')
+                    self.play_sound('check')
+
+                self.validate_checkmate()
                 return
                                     
         # Function call for selecting a certain piece from the komadai  
@@ -148,12 +222,8 @@ class GameMechanics(Board):
         if (self.current_player == players["sente"] and index == 0):
             piece = pieces[rank]
                         
-            if len(self.captured_pieces[self.current_player][piece]) > 0:
-                if self.captured_select[rank]:
-                    self.captured_pieces[self.current_player][piece][0].koma_selected = False
-
-                else: 
-                    self.captured_pieces[self.current_player][piece][0].koma_selected = True    
+            if self.captured_pieces[self.current_player][PIECE_CODES[piece]] > 0:
+                if self.captured_select[rank] is not True:
                     self.reset_koma_selection(rank, pieces) 
                     self.reset_piece_selection()
 
@@ -163,12 +233,8 @@ class GameMechanics(Board):
         elif self.current_player == players["gote"] and index == 1:
             piece = pieces[-(rank-6)]            
 
-            if len(self.captured_pieces[self.current_player][piece]) > 0:
-                if self.captured_select[-(rank-6)]:
-                    self.captured_pieces[self.current_player][piece][0].koma_selected = False
-
-                else:
-                    self.captured_pieces[self.current_player][piece][0].koma_selected = True
+            if self.captured_pieces[self.current_player][PIECE_CODES[piece]] > 0:
+                if self.captured_select[-(rank-6)] is not True:
                     self.reset_koma_selection(-(rank-6), pieces)  
                     self.reset_piece_selection()
 
@@ -183,7 +249,7 @@ class GameMechanics(Board):
             self.reset_piece_selection()
 
             # If the piece the user selected is equal to their turn, then that piece is selected
-            self.board[rank][file].selected = True
+            self.selected_square = rank, file
                 
             # Mouse logic to allow for deselection of piece if it has been clicked twicce
             if self.board[current_pos[0]][current_pos[1]] != self.board[rank][file]:
@@ -203,26 +269,29 @@ class GameMechanics(Board):
                 
                 
     def reset_piece_selection(self) -> None:
-        """ This function loops through the board array and resets any piece that had been selected. """
-        
-        for x, y in itertools.product(range(self.ranks), range(self.files)):
-            if self.board[x][y] != 0:  # Loops through all pieces and deselects them
-                self.board[x][y].selected = False
-                
+        """ This function deselects the piece on the board and on the komadai. """
+
+        self.selected_square = None
         self.captured_select = [False, False, False, False, False, False, False]
  
     
     def current_piece_position(self, rank: int, file: int):
-        """ This function loops through board array and returns the current position of a piece. """
-        
-        current_piece_position = rank, file
+        """ This function returns the position of the selected piece, or the given square if none is selected. """
+
+        return self.selected_square if self.selected_square is not None else (rank, file)
+
+
+    def legal_move_list(self, rank: int, file: int) -> tuple[list, list]:
+        """ This function returns the legal moves of the piece on a square in the same form as generate_move_list,
+            (file, rank) moves and (rank, file) captures, with moves that leave the king in check already left out. """
 
-        for x, y in itertools.product(range(self.ranks), range(self.files)):
-            if self.board[x][y] != 0 and self.board[x][y].selected is True:
-                # If a piece has been selected, its position is stored and returned as the current position
-                current_piece_position = x, y
+        targets = self.position.legal_targets(rank * 9 + file)
+        enemy = self.position.occupied[self.position.side ^ 1]
 
-        return current_piece_position
+        moves = [(to_sq % 9, to_sq // 9) for to_sq in square_bits(targets)]
+        captures = [divmod(to_sq, 9) for to_sq in square_bits(targets & enemy)]
+
+        return moves, captures
 
 
     def check_if_move_is_legal(self, rank, file, current_pos) -> None:
@@ -230,8 +299,7 @@ class GameMechanics(Board):
         
         move_made = False
         
-        self.generate_moves()
-        moves = self.board[current_pos[0]][current_pos[1]].move_set
+        moves, _ = self.legal_move_list(current_pos[0], current_pos[1])
         piece = self.board[current_pos[0]][current_pos[1]]
 
         if (file, rank) in moves:
@@ -241,18 +309,112 @@ class GameMechanics(Board):
         self.reset_piece_selection()
         
         if move_made is True:  # If a move has been made, turns are swapped and mouse clicks are reset
-            MOVE_SFX.play()
+            self.play_sound('move')
             print(f'{piece}: {self.board_notation(current_pos[0], current_pos[1])} ➟ {self.board_notation(rank, file)}')
             self.change_player_turns()
             
             if self.king_in_check():
-                MOVE_SFX.stop()
-                CAPTURE_SFX.stop()
-                KING_IN_CHECK_SFX.play()
-                        
+                self.stop_sound('move')
+                self.stop_sound('capture')
+                self.play_sound('check')
+
+            # Every move may leave the opponent without a legal reply, in check or not
+            self.validate_checkmate()
             self.clicks = 0
         
                                  
+    def play_engine_move(self) -> None:
+        """ This function lets the engine search the current position and plays its move on the board. """
+
+        if self.engine_search is None:
+            self.engine_search = ParallelSearch(ENGINE_WORKERS) if ENGINE_WORKERS > 1 else Search()
+
+        # The thinking time comes from what is left on the engine's clock, main time or byoyomi
+        clock, in_byoyomi = self.player_clock(self.current_player)
+        soft_limit, hard_limit = allocate_time(clock, in_byoyomi)
+
+        started = time.perf_counter()
+        move, _ = self.engine_search.think(self.position, soft_limit, hard_limit)
+        self.charge_clock(self.current_player, time.perf_counter() - started)
+        self.engine_pv = [usi_notation(pv_move) for pv_move in self.engine_search.pv]
+
+        # Without a legal move the engine has lost, by checkmate only if it is in check
+        if move == 0:
+            self.winner = self.user.upper()
+            self.reason_for_win = 'CHECKMATE' if self.position.in_check(self.position.side) else 'NO MOVES'
+            self.game_over = True
+            return
+
+        self.apply_move(move)
+
+
+    def solve_tsume(self, time_limit: float = TSUME_TIME_LIMIT) -> list[str] | None:
+        """ This function looks for a forced mate by the player to move from the current board and returns the
+            mating sequence in USI notation, or None if no mate was proven. """
+
+        # The solver plays its lines out on a copy, so the game's own position is never touched
+        solver = TsumeSolver(time_limit = time_limit)
+        sequence = solver.solve(self.position.copy())
+
+        return [usi_notation(move) for move in sequence] if sequence is not None else None
+
+
+    def player_clock(self, player: str) -> tuple[float, bool]:
+        """ This function returns the seconds left on a player's clock and whether they are in byoyomi. """
+
+        # The timer attributes are named after the player whose turn decrements them, so each player's clock is the
+        # attribute named after their opponent
+        match player:
+            case 'sente':
+                return self.gote_time, self.gote_initial_byoyomi is False
+
+            case 'gote':
+                return self.sente_time, self.sente_initial_byoyomi is False
+
+
+    def charge_clock(self, player: str, seconds: float) -> None:
+        """ This function takes the time the engine spent thinking off its clock, since the timer stops while it thinks. """
+
+        match player:
+            case 'sente':
+                self.gote_time -= seconds
+
+            case 'gote':
+                self.sente_time -= seconds
+
+
+    def apply_move(self, move: int) -> None:
+        """ This function plays a packed engine move on the board array and the komadai. """
+
+        rank, file = divmod(move_to(move), 9)
+
+        if is_drop(move):
+            # The dropped piece comes off the komadai count and a fresh piece object is placed onto the board
+            piece = PIECE_NAMES[drop_piece(move)]
+            self.captured_pieces[self.current_player][drop_piece(move)] -= 1
+            self.record_byoyomi_move()
+
+            self.board[rank][file] = self.hand_pieces[drop_piece(move)](rank, file, self.current_player)
+            self.position.make_move(move)
+            print(f'{piece}: 打 ➟ {self.board_notation(rank, file)}')
+
+        else:
+            start_position = divmod(move_from(move), 9)
+            piece = self.board[start_position[0]][start_position[1]]
+            self.piece_movement(start_position, (rank, file), is_promotion(move))
+            print(f'{piece}: {self.board_notation(*start_position)} ➟ {self.board_notation(rank, file)}')
+
+        self.play_sound('move')
+        self.change_player_turns()
+
+        if self.king_in_check():
+            self.stop_sound('move')
+            self.stop_sound('capture')
+            self.play_sound('check')
+
+        self.validate_checkmate()
+
+
     def move_piece_on_board(self, current_pos, rank, file) -> bool:
         """ This function moves a selected piece """
     
@@ -265,10 +427,12 @@ class GameMechanics(Board):
         match self.current_player:
             case 'sente':  # If sente's turn has been made, the current turn is switched to gote
                 self.current_player = 'gote'
+                self.position.set_side(GOTE)
                 return 'sente'
 
             case 'gote':  # If gote's turn has been made, the current turn is switched to sente
                 self.current_player = 'sente'
+                self.position.set_side(SENTE)
                 return 'gote'
         
         self.captured_select = [False, False, False, False, False, False, False]
@@ -287,10 +451,8 @@ class GameMechanics(Board):
                      or (self.board[start_position[0]][start_position[1]].player == 'gote' and end_position[0] in [7, 6]))
             ):
             
-            # Renders promotion window to ask player if they would like to promote their piece
-            promotion_menu.promotion_window(self.board[start_position[0]][start_position[1]]) 
-             
-            if promotion_menu.promoted:  # If the user selects 'yes', that piece is promoted
+            # Asks the player if they would like to promote their piece
+            if self.choose_promotion(self.board[start_position[0]][start_position[1]]):  # If 'yes', that piece is promoted
                 self.board[start_position[0]][start_position[1]].token_promoted = True
                 self.board[start_position[0]][start_position[1]].promotion_status = True
                 self.board[start_position[0]][start_position[1]].unpromotable_token = True
@@ -306,108 +468,32 @@ class GameMechanics(Board):
                 self.board[start_position[0]][start_position[1]].unpromotable_token = True
             
             
-    def find_king(self):
-        """ This function finds the current posititon of the King piece. """
-        
-        king_position = (4, 8) if self.current_player == 'sente' else (4, 0)
-        
-        for x, y in itertools.product(range(self.ranks), range(self.files)):
-            # If the piece is a king belonging to the current player, its position is returned
-            if self.board[x][y] != 0 and self.board[x][y].find_king is True and self.board[x][y].player == self.current_player:
-                king_position = (y, x)
-                
-        return king_position
-
-    
-    def generate_moves(self):
-        """ This function generates every move for every piece of a player. """
-        
-        moves = None
-        for x, y in itertools.product(range(self.ranks), range(self.files)):
-            if self.board[x][y] != 0 and self.board[x][y].selected:
-                moves = self.board[x][y]._moves(self.board)  # Function call to retrieve all moves
-                
-        return moves
-            
-        
-    def generate_opponents_moves(self):
-        """ This function generates every move for every piece of the opposing player. """
-        
-        opp_moves = []
-        for x, y in itertools.product(range(self.ranks), range(self.files)):
-            if self.board[x][y] != 0 and self.board[x][y].player != self.current_player:
-                opp_moves.extend(iter(self.board[x][y]._moves(self.board))) # Function call to retrieve all moves
-
-        return opp_moves
-    
-            
     def king_in_check(self) -> bool:
-        """ This function checks to see if king's position is in the move set of a piece, if so the king is in check. """
+        """ This function checks to see if the current player's king is attacked, and records its square if so. """
 
-        king_position = self.find_king()
-        
-        # If king in any of the opponets moves, its in check
-        if king_position in self.generate_opponents_moves():
-            self.board[king_position[1]][king_position[0]].king_in_check = True
-            return True
-
-        # If the player turn swapped and the king isnt in any of the opponets moves, its not in check
-        elif self.current_player != self.current_player or self.board[king_position[1]][king_position[0]].king_in_check:
-            self.board[king_position[1]][king_position[0]].king_in_check = False
+        player = PLAYERS.index(self.current_player)
+        king_sq = self.position.king_squares[player]
+        if king_sq is None:
             return False
 
-    
-    def validate_checkmate(self) -> None:
-        """ This function validates if the king piece is in a state of checkmate. """
-        
-        kings_moves = []
-        king_position = self.find_king()
-        self.board[king_position[1]][king_position[0]].checkmate = False
-
-        # Find all current king moves
-        for x, y in itertools.product(range(self.ranks), range(self.files)):
-            if self.board[x][y] != 0 and self.board[x][y].find_king is True and self.board[x][y].player == self.current_player:
-                kings_moves.extend(iter(self.board[x][y]._moves(self.board)))
-
-        for moves in self.generate_opponents_moves():
-            # If any of the opponents moves share the same moves as the king, then that move is removed from the king piece
-            if moves in kings_moves:
-                kings_moves.remove(moves)
-        
-        # If the king has no more moves, and is in check, then checkmate has occured
-        if not kings_moves and self.king_in_check() is True:
-            self.board[king_position[1]][king_position[0]].checkmate = True
+        # The attack maps of the engine position answer directly, without generating every opposing move
+        in_check = self.position.in_check(player)
+        self.checked_king = divmod(king_sq, 9) if in_check else None
+
+        return in_check
 
-        # Game over once checkmate occurs
-        if self.board[king_position[1]][king_position[0]].checkmate:
-            self.change_player_turns()
-            self.winner = self.current_player.upper()
-            self.reason_for_win = 'CHECKMATE'
-            self.game_over = True
     
+    def validate_checkmate(self) -> None:
+        """ This function ends the game once the player to move has no legal move or drop left, which is checkmate
+            when their king is in check. The search stops at the first legal move it finds. """
 
-    def filter_valid_moves(self, start_position, end_position) -> bool:
-        """ This function prevents moves that put the king in check or leave the king in check. """
-        
-        prev_check = self.king_in_check()
-        self.generate_moves()
-        
-        # Current check status or future check status
-        if self.king_in_check() or (prev_check is True and self.king_in_check()):
-            
-            current_piece_pos = self.board[end_position[0]][end_position[1]]  # Current piece selected
-            reset_current_piece_position = 0
-                        
-            current_piece_pos.move_img_pos(start_position)  # Moves piece to the desired end position
-            
-            MOVE_SFX.stop()
-             
-            self.board[start_position[0]][start_position[1]] = current_piece_pos
-            self.board[end_position[0]][end_position[1]] = reset_current_piece_position  # Resets that pieces old position to 0
-            
-            return False
+        if self.position.has_legal_move():
+            return
 
-        return True
+        loser = self.position.side
+        self.winner = PLAYERS[loser ^ 1].upper()
+        self.reason_for_win = 'CHECKMATE' if self.position.in_check(loser) else 'NO MOVES'
+        self.game_over = True
     
             
 class InitializeGame(GameMechanics):
@@ -427,6 +513,8 @@ class InitializeGame(GameMechanics):
         self.game_over = False
         
         self.engine_turn = False
+        self.engine_pv = []
+        self.checked_king = None
 
         self.sente_time = 300
         self.gote_time = 300
@@ -468,19 +556,19 @@ class InitializeGame(GameMechanics):
                 if self.gote_initial_byoyomi is True:
 
                     if 10.915 > self.gote_time > 10.900:
-                        LOW_TIME_SFX.play()
+                        self.play_sound('low_time')
 
                     if self.gote_time <= 0:
                         self.gote_time = 11
                         self.gote_initial_byoyomi = False
                         self.sente_byoyomi_period = True
-                        PERIOD_SFX.play()
+                        self.play_sound('period')
 
                 elif self.gote_time <= 0.5:
 
                     # If gote's time is less the 1, then they loose by time out
                     if 0.50 >= self.gote_time >= 0.49:
-                        GAME_OVER_SFX.play()
+                        self.play_sound('game_over')
                     else:
                         self.gote_time = 0
                         self.winner = 'GOTE'
@@ -500,11 +588,11 @@ class InitializeGame(GameMechanics):
                 if self.sente_initial_byoyomi is True:
 
                     if 10.915 >= self.sente_time >= 10.880:
-                        LOW_TIME_SFX.play()
+                        self.play_sound('low_time')
 
                     if self.sente_time <= 0:
                         self.sente_time = 11
-                        PERIOD_SFX.play()
+                        self.play_sound('period')
                         self.sente_initial_byoyomi = False
                         self.gote_byoyomi_period = True
 
@@ -512,7 +600,7 @@ class InitializeGame(GameMechanics):
                     
                     # If gote's time is less the 1, then they loose by time out
                     if 0.50 >= self.sente_time >= 0.49:
-                        GAME_OVER_SFX.play()
+                        self.play_sound('game_over')
                     else:
                         self.sente_time = 0
                         self.winner = 'SENTE'
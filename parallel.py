@@ -0,0 +1,115 @@
+""" This is the 'parallel' module that runs the engine search on several processes at once (lazy SMP). Every process
+searches the same root, and they share what they find through a transposition table in shared memory, so the helpers
+fill the table with results that the main search then picks up as cutoffs and hash moves. """
+
+import atexit
+import multiprocessing
+import multiprocessing.util
+
+from constants import *
+from position import Position
+from search import Search
+from transposition import SharedTranspositionTable
+
+
+_worker_search = None  # Search of a helper process, attached to the shared table once when the process starts
+
+
+def init_worker(table_name: str, stop_event) -> None:
+    """ This function attaches a helper process to the shared table and sets up its search. """
+
+    global _worker_search
+
+    _worker_search = Search(tt = SharedTranspositionTable.attach(table_name))
+    _worker_search.stop_event = stop_event
+
+    # Pool helpers leave through os._exit, which skips the table's own exit hook, so its close is registered with
+    # multiprocessing's finalizers, which a helper does run
+    multiprocessing.util.Finalize(None, _worker_search.tt.close, exitpriority = 10)
+
+
+def search_worker(worker: int, position: Position, hard_limit: float) -> dict:
+    """ This function runs a helper's search until the main process stops it and returns what it completed. """
+
+    search = _worker_search
+
+    # Odd helpers start a ply deeper, so the helpers spread over two depths instead of all repeating the same one
+    search.think(position, hard_limit, hard_limit, start_depth = 1 + worker % 2)
+
+    return {'worker': worker, 'move': search.best_move, 'score': search.best_score, 'depth': search.depth,
+            'nodes': search.nodes + search.qnodes, 'probes': search.tt.probes, 'hits': search.tt.hits}
+
+
+class ParallelSearch:
+
+    def __init__(self, workers: int = ENGINE_WORKERS, tt_size_mb: int = 16) -> None:
+        self.workers = max(workers, 1)  # Processes searching, the main process included
+        self.tt = SharedTranspositionTable(tt_size_mb)
+        self.search = Search(tt = self.tt)
+
+        context = multiprocessing.get_context()
+        self.stop_event = context.Event()
+        self.pool = context.Pool(self.workers - 1, initializer = init_worker,
+                                 initargs = (self.tt.name, self.stop_event)) if self.workers > 1 else None
+
+        self.best_move = 0
+        self.best_score = 0
+        self.depth = 0
+        self.pv = []
+        self.nodes = 0
+        self.worker_nodes = [0] * self.workers  # Nodes of the last search, the main process first and then each helper
+        self.hit_rate = 0.0  # Share of shared table probes that found an entry, over every process
+
+        atexit.register(self.close)
+
+
+    def think(self, position: Position, soft_limit: float, hard_limit: float) -> tuple[int, int]:
+        """ This function searches a position on every process until the main search is done and returns the best
+            completed result. The helpers are stopped as soon as the main search returns. """
+
+        self.stop_event.clear()
+
+        jobs = []
+        if self.pool is not None:
+            jobs = [self.pool.apply_async(search_worker, (worker, position, hard_limit))
+                    for worker in range(1, self.workers)]
+
+        self.search.think(position, soft_limit, hard_limit)
+        self.stop_event.set()
+
+        results = [{'worker': 0, 'move': self.search.best_move, 'score': self.search.best_score,
+                    'depth': self.search.depth, 'nodes': self.search.nodes + self.search.qnodes,
+                    'probes': self.tt.probes, 'hits': self.tt.hits}]
+        results += [job.get() for job in jobs]
+
+        # The deepest completed iteration wins, with the main search first among equals
+        best = max((result for result in results if result['move']), key = lambda result: result['depth'],
+                   default = results[0])
+
+        self.best_move, self.best_score, self.depth = best['move'], best['score'], best['depth']
+        self.pv = self.search.principal_variation(position) if self.best_move else []
+        self.worker_nodes = [result['nodes'] for result in sorted(results, key = lambda result: result['worker'])]
+        self.nodes = sum(self.worker_nodes)
+
+        # Each process counts its own probes of the shared table, so the hit rate is summed over the results
+        probes = sum(result['probes'] for result in results)
+        self.hit_rate = sum(result['hits'] for result in results) / probes if probes else 0.0
+
+        # The table's line may come from another iteration, it is only shown if it starts with the chosen move
+        if self.pv[:1] != [self.best_move]:
+            self.pv = [self.best_move] if self.best_move else []
+
+        return self.best_move, self.best_score
+
+
+    def close(self) -> None:
+        """ This function shuts down the helper processes and frees the shared table. """
+
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+        if self.tt is not None:
+            self.tt.close()
+            self.tt = None
@@ -0,0 +1,288 @@
+""" This is the 'perft' module that counts the leaf nodes of the legal move tree, to verify and time the engine's move
+generator. Counts from the starting position are checked against the published shogi perft numbers.
+
+Usage: python perft.py <depth> [divide] [parallel] [split2] [hashed]   or   python perft.py check [max_depth]
+   or   python perft.py verify [games] """
+
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from constants import *
+from bitboards import *
+from position import Position, usi_notation
+
+
+""" KNOWN COUNTS. """
+# Leaf nodes from the starting position at each depth, drops and promotion choices included
+STARTING_PERFT = {1: 30, 2: 900, 3: 25470, 4: 719731, 5: 19861490, 6: 516925165}
+
+""" HASHED PERFT. """
+PERFT_CACHE_LIMIT = 1 << 21  # Entries a process keeps in its perft cache before starting it afresh
+
+_perft_cache = {}  # Counts already found by this process, keyed by Zobrist key and depth
+
+""" CONSISTENCY CHECKS. """
+VERIFY_GAMES = 10  # Random games played by verify
+VERIFY_PLIES = 150  # Plies after which a random game is cut off
+
+
+def perft(position: Position, depth: int, cache: dict = None) -> int:
+    """ This function returns the number of legal move sequences of a depth from a position. With a cache, the count
+        below a position reached again through another move order is looked up instead of being recounted. """
+
+    if depth == 0:
+        return 1
+
+    # Single moves are cheaper to count again than to look up
+    cache_key = position.key << 8 | depth
+    if cache is not None and depth > 1 and cache_key in cache:
+        return cache[cache_key]
+
+    moves = position.generate_legal()
+
+    # The last ply is counted straight from the legal generator without playing its moves
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        undo = position.make_move(move)
+        nodes += perft(position, depth - 1, cache)
+        position.unmake_move(undo)
+
+    if cache is not None and depth > 1:
+        if len(cache) >= PERFT_CACHE_LIMIT:
+            cache.clear()
+        cache[cache_key] = nodes
+
+    return nodes
+
+
+def perft_task(state: bytes, moves: tuple, depth: int, hashed: bool) -> int:
+    """ This function counts the subtree below a line of moves in a worker process, from a serialized position. """
+
+    position = Position.deserialize(state)
+    for move in moves:
+        position.make_move(move)
+
+    return perft(position, depth, _perft_cache if hashed else None)
+
+
+def parallel_divide(position: Position, depth: int, workers: int = None, split_depth: int = 1,
+                    hashed: bool = False) -> dict[int, int]:
+    """ This function returns the perft count below every legal root move, with the subtrees counted by a pool of
+        processes. The tree is split at the root, or at the second ply for more and smaller tasks. """
+
+    state = position.serialize()
+    lines = [(move,) for move in position.legal_moves()]
+
+    if split_depth > 1 and depth > 2:
+        split_lines = []
+
+        for line in lines:
+            undo = position.make_move(line[0])
+            split_lines.extend(line + (reply,) for reply in position.legal_moves())
+            position.unmake_move(undo)
+
+        lines = split_lines
+
+    counts = {line[0]: 0 for line in lines}
+
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        tasks = [executor.submit(perft_task, state, line, depth - len(line), hashed) for line in lines]
+
+        for line, task in zip(lines, tasks):
+            counts[line[0]] += task.result()
+
+    return counts
+
+
+def divide(position: Position, depth: int, show: bool = True) -> dict[int, int]:
+    """ This function returns the perft count below every legal root move, printing each one with its total and speed. """
+
+    counts = {}
+    started = time.perf_counter()
+
+    for move in position.legal_moves():
+        undo = position.make_move(move)
+        counts[move] = perft(position, depth - 1)
+        position.unmake_move(undo)
+
+        if show:
+            print(f'{usi_notation(move)}: {counts[move]}')
+
+    if show:
+        report(sum(counts.values()), time.perf_counter() - started)
+
+    return counts
+
+
+def report(nodes: int, elapsed: float) -> None:
+    """ This function prints a node count with the time it took and the nodes searched per second. """
+
+    print(f'Nodes: {nodes}  Time: {elapsed:.2f}s  NPS: {int(nodes / elapsed) if elapsed > 0 else 0}')
+
+
+def check(max_depth: int = 4) -> bool:
+    """ This function compares perft from the starting position with the known counts, up to a depth. """
+
+    # Depths without a published count cannot be checked
+    if max_depth not in STARTING_PERFT:
+        print(f'No known perft count at depth {max_depth}, choose a depth from 1 to {max(STARTING_PERFT)}')
+        return False
+
+    passed = True
+
+    for depth in range(1, max_depth + 1):
+        started = time.perf_counter()
+        nodes = perft(Position.initial(), depth)
+        elapsed = time.perf_counter() - started
+
+        expected = STARTING_PERFT[depth]
+        passed = passed and nodes == expected
+
+        print(f'Depth {depth}: {nodes} (expected {expected}) {"OK" if nodes == expected else "FAILED"}')
+        report(nodes, elapsed)
+
+    return passed
+
+
+def reference_slider_attacks(player: int, piece: int, sq: int, occupied: int) -> int:
+    """ This function walks the rays of a sliding piece one square at a time, the slow way the tables replace. """
+
+    if piece == LANCE:
+        return ray_attacks(sq, ((-1, 0),) if player == SENTE else ((1, 0),), occupied)
+
+    attacks = ray_attacks(sq, BISHOP_DIRECTIONS if piece in (BISHOP, HORSE) else ROOK_DIRECTIONS, occupied)
+    return attacks | STEP_ATTACKS[player][piece][sq] if piece > KING else attacks
+
+
+def verify_position(position: Position) -> list[str]:
+    """ This function recomputes everything the position keeps incrementally or looks up from tables, the slow way,
+        and returns a description of every mismatch. """
+
+    errors = []
+    occupied = position.occupied[SENTE] | position.occupied[GOTE]
+
+    # The legal generator must agree with playing every generated move and testing the king
+    legal = sorted(position.generate_legal())
+    filtered = sorted(move for move in position.generate_moves() if position.is_legal(move))
+    if legal != filtered:
+        missing = [usi_notation(move) for move in filtered if move not in legal]
+        extra = [usi_notation(move) for move in legal if move not in filtered]
+        errors.append(f'legal moves differ, missing {missing} extra {extra}')
+
+    # Hash and killer moves are screened by is_pseudo_legal, so it must accept exactly the generated moves and drops
+    generated = set(position.generate_moves())
+    if not all(position.is_pseudo_legal(move) for move in generated):
+        errors.append('is_pseudo_legal rejects a generated move')
+
+    for piece in HAND_TYPES:
+        for to_sq in range(SQUARES):
+            drop = to_sq | (SQUARES + piece) << 7
+            if position.is_pseudo_legal(drop) != (drop in generated):
+                errors.append(f'is_pseudo_legal disagrees with the generator on {usi_notation(drop)}')
+
+    if position.compute_key() != position.key:
+        errors.append('incremental key differs from compute_key')
+
+    if rotate(occupied) != position.lines:
+        errors.append('rotated occupancy differs from the board')
+
+    # Attack maps rebuilt from nothing, and every slider checked against the ray walker
+    attackers = [0] * SQUARES
+    for sq, code in enumerate(position.squares):
+        if code == 0:
+            continue
+
+        player, piece = (SENTE, code) if code > 0 else (GOTE, -code)
+        attacks = attacks_from(player, piece, sq, position.lines)
+
+        if piece in SLIDERS and attacks != reference_slider_attacks(player, piece, sq, occupied):
+            errors.append(f'slider attacks differ from the ray walker on square {sq}')
+
+        if attacks != position.attacks[sq]:
+            errors.append(f'attack map differs on square {sq}')
+
+        for to_sq in square_bits(attacks):
+            attackers[to_sq] |= SQUARE_BB[sq]
+
+    if attackers != position.attackers:
+        errors.append('attackers map differs from a full recomputation')
+
+    for sq in range(SQUARES):
+        for player in (SENTE, GOTE):
+            if position.compute_attackers(sq, player) != position.attackers_to(sq, player):
+                errors.append(f'compute_attackers differs from the map on square {sq}')
+
+    return errors
+
+
+def verify(games: int = VERIFY_GAMES, seed: int = 0) -> bool:
+    """ This function plays random games and checks every position they reach with verify_position, then unmakes
+        each game and checks the starting position comes back unchanged. """
+
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    positions = 0
+    passed = True
+
+    for game in range(games):
+        position = Position.initial()
+        initial_state, initial_key = position.serialize(), position.key
+        undos = []
+
+        for ply in range(VERIFY_PLIES):
+            errors = verify_position(position)
+            positions += 1
+
+            for error in errors:
+                print(f'Game {game + 1} ply {ply}: {error}')
+            passed = passed and not errors
+
+            moves = position.generate_legal()
+            if not moves:
+                break
+
+            undos.append(position.make_move(rng.choice(moves)))
+
+        for undo in reversed(undos):
+            position.unmake_move(undo)
+
+        if (position.serialize(), position.key) != (initial_state, initial_key) or verify_position(position):
+            print(f'Game {game + 1}: unmaking the game did not restore the starting position')
+            passed = False
+
+    print(f'Positions: {positions}  Time: {time.perf_counter() - started:.2f}s  {"OK" if passed else "FAILED"}')
+    return passed
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'check':
+        sys.exit(0 if check(int(sys.argv[2]) if len(sys.argv) > 2 else 4) else 1)
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'verify':
+        sys.exit(0 if verify(int(sys.argv[2]) if len(sys.argv) > 2 else VERIFY_GAMES) else 1)
+
+    perft_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    options = sys.argv[2:]
+    perft_started = time.perf_counter()
+
+    if 'parallel' in options:
+        root_counts = parallel_divide(Position.initial(), perft_depth, split_depth = 2 if 'split2' in options else 1,
+                                      hashed = 'hashed' in options)
+
+        if 'divide' in options:
+            for root_move, root_count in root_counts.items():
+                print(f'{usi_notation(root_move)}: {root_count}')
+
+        report(sum(root_counts.values()), time.perf_counter() - perft_started)
+
+    elif 'divide' in options:
+        divide(Position.initial(), perft_depth)
+
+    else:
+        report(perft(Position.initial(), perft_depth, {} if 'hashed' in options else None),
+               time.perf_counter() - perft_started)
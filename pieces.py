@@ -2,52 +2,50 @@
 
 from constants import TOP, BOTTOM, LEFT, RIGHT
 from board import GeneratePieces
-from board import GenerateGameBoard
 
-obj_board = GenerateGameBoard()
 
 class GenerateMoves(GeneratePieces):
 
+    __slots__ = ('top', 'right', 'left', 'bottom', 'top_right', 'top_left', 'bottom_right', 'bottom_left')
+
     def __init__(self, rank: int, file: int, player: str) -> None:
         super().__init__(rank = rank, file = file, player = player)
-        self.board = obj_board.board
-        self.move_boundaries()
                 
                 
-    def move_boundaries(self) -> None:
-        """ This function generates the boundries for each type of move. """
+    def move_boundaries(self, board: list[int]) -> None:
+        """ This function generates the boundries for each type of move on the board it is given. """
     
         self.top = (self.rank > TOP and
-                    (self.board[self.rank - 1][self.file] == 0 or
-                     self.board[self.rank - 1][self.file] != 0))
+                    (board[self.rank - 1][self.file] == 0 or
+                     board[self.rank - 1][self.file] != 0))
 
         self.right = (self.file < RIGHT and
-                      (self.board[self.rank][self.file + 1] == 0 or
-                       self.board[self.rank][self.file + 1] != 0))
+                      (board[self.rank][self.file + 1] == 0 or
+                       board[self.rank][self.file + 1] != 0))
 
         self.left = (self.file > LEFT and
-                     (self.board[self.rank][self.file - 1] == 0 or
-                      self.board[self.rank][self.file - 1] != 0))
+                     (board[self.rank][self.file - 1] == 0 or
+                      board[self.rank][self.file - 1] != 0))
 
         self.bottom = (self.rank < BOTTOM and
-                       (self.board[self.rank + 1][self.file] == 0 or
-                        self.board[self.rank + 1][self.file] != 0))
+                       (board[self.rank + 1][self.file] == 0 or
+                        board[self.rank + 1][self.file] != 0))
 
         self.top_right = ((self.rank > TOP and self.file < RIGHT) and
-                          (self.board[self.rank - 1][self.file + 1] == 0 or
-                           self.board[self.rank - 1][self.file + 1] != 0))
+                          (board[self.rank - 1][self.file + 1] == 0 or
+                           board[self.rank - 1][self.file + 1] != 0))
 
         self.top_left = ((self.rank > TOP and self.file > LEFT) and
-                         (self.board[self.rank - 1][self.file - 1] == 0 or
-                          self.board[self.rank - 1][self.file - 1] != 0))
+                         (board[self.rank - 1][self.file - 1] == 0 or
+                          board[self.rank - 1][self.file - 1] != 0))
 
         self.bottom_right = ((self.rank < BOTTOM and self.file < RIGHT) and
-                             (self.board[self.rank + 1][self.file + 1] == 0 or
-                              self.board[self.rank + 1][self.file + 1] != 0))
+                             (board[self.rank + 1][self.file + 1] == 0 or
+                              board[self.rank + 1][self.file + 1] != 0))
 
         self.bottom_left = ((self.rank < BOTTOM and self.file > LEFT) and
-                            (self.board[self.rank + 1][self.file - 1] == 0 or
-                             self.board[self.rank + 1][self.file - 1] != 0))
+                            (board[self.rank + 1][self.file - 1] == 0 or
+                             board[self.rank + 1][self.file - 1] != 0))
         
     
     def generate_base_moves(self, board, move_set: list, capture_set: list,
@@ -70,7 +68,7 @@ class GenerateMoves(GeneratePieces):
     def generate_promoted_base_moves(self, board: list[int], move_list: list[int], capture_list: list[int]) -> None:
         """ This function generates the extra moves for a promoted bishop piece. """
         
-        self.move_boundaries()
+        self.move_boundaries(board)
         
         match self.player:
             
@@ -103,7 +101,7 @@ class GenerateMoves(GeneratePieces):
     def generate_promoted_rook_moves(self, board: list[int], move_list: list[int], capture_list: list[int]) -> None:
         """ This function generates the extra moves for a promoted rook piece. """
         
-        self.move_boundaries()
+        self.move_boundaries(board)
         
         match self.player:
 
@@ -134,7 +132,7 @@ class GenerateMoves(GeneratePieces):
 
     def generate_promoted_bishop_moves(self, board: list[int], move_list: list[int], capture_list: list[int]) -> None:
         
-        self.move_boundaries()
+        self.move_boundaries(board)
         
         match self.player:
 
@@ -163,6 +161,7 @@ class GenerateMoves(GeneratePieces):
 
 
 class King(GenerateMoves):
+    __slots__ = ()
     pc_idx = 0
 
     def __init__(self, rank: int, file: int, player: str) -> None:
@@ -183,7 +182,7 @@ class King(GenerateMoves):
         match self.player:
 
             case 'sente':
-                self.move_boundaries()
+                self.move_boundaries(board)
                 
                 legal_moves = [self.top, self.right, self.left, self.bottom,
                                self.top_right, self.top_left, self.bottom_right, self.bottom_left]
@@ -202,7 +201,7 @@ class King(GenerateMoves):
                     
                                 
             case 'gote':
-                self.move_boundaries()
+                self.move_boundaries(board)
                 
                 legal_moves = [self.top, self.right, self.left, self.bottom,
                                self.top_right, self.top_left, self.bottom_right, self.bottom_left]
@@ -220,6 +219,7 @@ class King(GenerateMoves):
         
 
 class GoldGeneral(GenerateMoves):
+    __slots__ = ()
     pc_idx = 1
 
     def __init__(self, rank: int, file: int, player: str) -> None:
@@ -240,7 +240,7 @@ class GoldGeneral(GenerateMoves):
         match self.player:
 
             case 'sente':
-                self.move_boundaries()
+                self.move_boundaries(board)
                 
                 legal_moves = [self.top, self.right, self.left, self.bottom,
                             self.top_right, self.top_left]
@@ -254,7 +254,7 @@ class GoldGeneral(GenerateMoves):
                     self.generate_base_moves(board, move_list, capture_list, legal_moves[moves], positions[moves])
 
             case 'gote':
-                self.move_boundaries()
+                self.move_boundaries(board)
                 
                 legal_moves = [self.bottom, self.left, self.right, self.top,
                             self.bottom_left, self.bottom_right]
@@ -271,6 +271,7 @@ class GoldGeneral(GenerateMoves):
 
 
 class SilverGeneral(GenerateMoves):
+    __slots__ = ()
     pc_idx = 2
     promoted_pc_idx = 0
 
@@ -291,7 +292,7 @@ class SilverGeneral(GenerateMoves):
         match self.player:
 
             case 'sente':
-                self.move_boundaries()
+                self.move_boundaries(board)
                 
                 # If piece is promoted, use new move set
                 if self.token_promoted:
@@ -310,7 +311,7 @@ class SilverGeneral(GenerateMoves):
                                 
                                 
             case 'gote':
-                self.move_boundaries()
+                self.move_boundaries(board)
                 
                 # If piece is promoted, use new move set
                 if self.token_promoted:
@@ -331,6 +332,7 @@ class SilverGeneral(GenerateMoves):
 
 
 class Knight(GenerateMoves):
+    __slots__ = ()
     pc_idx = 3
     promoted_pc_idx = 1
 
@@ -348,20 +350,20 @@ class Knight(GenerateMoves):
         capture_list = []
         
         self.top_right = ((self.rank > TOP and self.file < RIGHT) and
-                          (self.board[self.rank - 2][self.file + 1] == 0 or
-                           self.board[self.rank - 2][self.file + 1] != 0))
+                          (board[self.rank - 2][self.file + 1] == 0 or
+                           board[self.rank - 2][self.file + 1] != 0))
 
         self.top_left = ((self.rank > TOP and self.file > LEFT) and
-                         (self.board[self.rank - 2][self.file - 1] == 0 or
-                          self.board[self.rank - 2][self.file - 1] != 0))
+                         (board[self.rank - 2][self.file - 1] == 0 or
+                          board[self.rank - 2][self.file - 1] != 0))
         
         self.bottom_right = ((self.rank < BOTTOM and self.file < RIGHT) and
-                             (self.board[self.rank + 2][self.file + 1] == 0 or
-                              self.board[self.rank + 2][self.file + 1] != 0))
+                             (board[self.rank + 2][self.file + 1] == 0 or
+                              board[self.rank + 2][self.file + 1] != 0))
 
         self.bottom_left = ((self.rank < BOTTOM and self.file > LEFT) and
-                            (self.board[self.rank + 2][self.file - 1] == 0 or
-                             self.board[self.rank + 2][self.file - 1] != 0))
+                            (board[self.rank + 2][self.file - 1] == 0 or
+                             board[self.rank + 2][self.file - 1] != 0))
 
         match self.player:
 
@@ -402,6 +404,7 @@ class Knight(GenerateMoves):
         
 
 class Lance(GenerateMoves):
+    __slots__ = ()
     pc_idx = 4
     promoted_pc_idx = 2
 
@@ -431,8 +434,8 @@ class Lance(GenerateMoves):
                     # All forward legal moves for sente's lance piece                                     
                     for incr_rank in range(self.rank, 0, -1):
                         
-                        self.top = (self.rank > TOP and (self.board[incr_rank - 1][self.file] == 0 
-                                                        or self.board[incr_rank - 1][self.file] != 0))  
+                        self.top = (self.rank > TOP and (board[incr_rank - 1][self.file] == 0 
+                                                        or board[incr_rank - 1][self.file] != 0))  
                         
                         # Function call to generate base moves 
                         self.generate_base_moves(board, move_list, capture_list, self.top, (incr_rank - 1, self.file))
@@ -465,6 +468,7 @@ class Lance(GenerateMoves):
 
 
 class Rook(GenerateMoves):
+    __slots__ = ()
     pc_idx = 5
     promoted_pc_idx = 3
 
@@ -492,8 +496,8 @@ class Rook(GenerateMoves):
                 # All forward legal moves for sente's Rook piece                           
                 for incr_top_rank in range(self.rank, 0, -1):
                     
-                    self.top = (self.rank > TOP and (self.board[incr_top_rank - 1][self.file] == 0 
-                                                     or self.board[incr_top_rank - 1][self.file] != 0))  
+                    self.top = (self.rank > TOP and (board[incr_top_rank - 1][self.file] == 0 
+                                                     or board[incr_top_rank - 1][self.file] != 0))  
                     
                     # Function call to generate base moves 
                     self.generate_base_moves(board, move_list, capture_list, self.top, (incr_top_rank - 1, self.file))
@@ -506,8 +510,8 @@ class Rook(GenerateMoves):
                 # All right legal moves for sente's Rook piece  
                 for incr_right_file in range(self.file, 8, +1):
                     
-                    self.right = (self.file < RIGHT and (self.board[self.rank][incr_right_file + 1] == 0 
-                                                     or self.board[self.rank][incr_right_file + 1] != 0))  
+                    self.right = (self.file < RIGHT and (board[self.rank][incr_right_file + 1] == 0 
+                                                     or board[self.rank][incr_right_file + 1] != 0))  
                     
                     # Function call to generate base moves      
                     self.generate_base_moves(board, move_list, capture_list, self.right, (self.rank, incr_right_file + 1))
@@ -520,8 +524,8 @@ class Rook(GenerateMoves):
                 # All left legal moves for sente's Rook piece 
                 for incr_left_file in range(self.file, 0, -1):
                     
-                    self.left = (self.file > LEFT and (self.board[self.rank][incr_left_file - 1] == 0 
-                                                     or self.board[self.rank][incr_left_file - 1] != 0))  
+                    self.left = (self.file > LEFT and (board[self.rank][incr_left_file - 1] == 0 
+                                                     or board[self.rank][incr_left_file - 1] != 0))  
                     
                     # Function call to generate base moves      
                     self.generate_base_moves(board, move_list, capture_list, self.left, (self.rank, incr_left_file - 1))
@@ -534,8 +538,8 @@ class Rook(GenerateMoves):
                 # All bottom legal moves for sente's Rook piece 
                 for incr_bottom_rank in range(self.rank, 8, +1):
                     
-                    self.bottom = (self.rank < BOTTOM and (self.board[incr_bottom_rank + 1][self.file] == 0 
-                                                     or self.board[incr_bottom_rank + 1][self.file] != 0))  
+                    self.bottom = (self.rank < BOTTOM and (board[incr_bottom_rank + 1][self.file] == 0 
+                                                     or board[incr_bottom_rank + 1][self.file] != 0))  
                     
                     # Function call to generate base moves      
                     self.generate_base_moves(board, move_list, capture_list, self.bottom, (incr_bottom_rank + 1, self.file))
@@ -550,8 +554,8 @@ class Rook(GenerateMoves):
                 # All forward legal moves for gote's Rook piece   
                 for incr_top_rank in range(self.rank, 8, +1):
                     
-                    self.bottom = (self.rank < BOTTOM and (self.board[incr_top_rank + 1][self.file] == 0 
-                                                     or self.board[incr_top_rank + 1][self.file] != 0))  
+                    self.bottom = (self.rank < BOTTOM and (board[incr_top_rank + 1][self.file] == 0 
+                                                     or board[incr_top_rank + 1][self.file] != 0))  
                     
                     # Function call to generate base moves      
                     self.generate_base_moves(board, move_list, capture_list, self.bottom, (incr_top_rank + 1, self.file))
@@ -563,8 +567,8 @@ class Rook(GenerateMoves):
                 # All left legal moves for gote's Rook piece 
                 for incr_left_file in range(self.file, 8, +1):
                     
-                    self.right = (self.file < RIGHT and (self.board[self.rank][incr_left_file + 1] == 0 
-                                                     or self.board[self.rank][incr_left_file + 1] != 0))  
+                    self.right = (self.file < RIGHT and (board[self.rank][incr_left_file + 1] == 0 
+                                                     or board[self.rank][incr_left_file + 1] != 0))  
                     
                     # Function call to generate base moves      
                     self.generate_base_moves(board, move_list, capture_list, self.right, (self.rank, incr_left_file + 1))
@@ -577,8 +581,8 @@ class Rook(GenerateMoves):
                 # All right legal moves for gote's Rook piece
                 for incr_right_file in range(self.file, 0, -1):
                     
-                    self.left = (self.file > LEFT and (self.board[self.rank][incr_right_file - 1] == 0 
-                                                     or self.board[self.rank][incr_right_file - 1] != 0))  
+                    self.left = (self.file > LEFT and (board[self.rank][incr_right_file - 1] == 0 
+                                                     or board[self.rank][incr_right_file - 1] != 0))  
                     
                     # Function call to generate base moves      
                     self.generate_base_moves(board, move_list, capture_list, self.left, (self.rank, incr_right_file - 1))
@@ -591,8 +595,8 @@ class Rook(GenerateMoves):
                 # All bottom legal moves for gote's Rook piece
                 for incr_bottom_rank in range(self.rank, 0, -1):
                     
-                    self.top = (self.rank > TOP and (self.board[incr_bottom_rank - 1][self.file] == 0 
-                                                     or self.board[incr_bottom_rank - 1][self.file] != 0))  
+                    self.top = (self.rank > TOP and (board[incr_bottom_rank - 1][self.file] == 0 
+                                                     or board[incr_bottom_rank - 1][self.file] != 0))  
                     
                     # Function call to generate base moves      
                     self.generate_base_moves(board, move_list, capture_list, self.top, (incr_bottom_rank - 1, self.file))
@@ -609,6 +613,7 @@ class Rook(GenerateMoves):
 
 
 class Bishop(GenerateMoves):
+    __slots__ = ()
     pc_idx = 6
     promoted_pc_idx = 4
 
@@ -629,15 +634,15 @@ class Bishop(GenerateMoves):
 
             case 'sente':
                 
-                self.move_boundaries()
+                self.move_boundaries(board)
                 incr_top_right_file, incr_top_left_file  = self.file, self.file  
                 
                 # All top right legal moves for sente's Bishop piece
                 for incr_top_right_rank in range(self.rank, 0, -1):
                     
                     self.top_right = ((incr_top_right_rank > TOP and incr_top_right_file < RIGHT) and
-                                    (self.board[incr_top_right_rank- 1][incr_top_right_file + 1] == 0 or
-                                    self.board[incr_top_right_rank - 1][incr_top_right_file + 1] != 0))
+                                    (board[incr_top_right_rank- 1][incr_top_right_file + 1] == 0 or
+                                    board[incr_top_right_rank - 1][incr_top_right_file + 1] != 0))
                     
                     self.generate_base_moves(board, move_list, capture_list, self.top_right, 
                                              (incr_top_right_rank - 1, incr_top_right_file + 1))
@@ -652,8 +657,8 @@ class Bishop(GenerateMoves):
                 for incr_top_left_rank in range(self.rank, 0, -1):
                     
                     self.top_left = ((incr_top_left_rank > TOP and incr_top_left_file > LEFT) and
-                                    (self.board[incr_top_left_rank - 1][incr_top_left_file - 1] == 0 or
-                                    self.board[incr_top_left_rank - 1][incr_top_left_file - 1] != 0))
+                                    (board[incr_top_left_rank - 1][incr_top_left_file - 1] == 0 or
+                                    board[incr_top_left_rank - 1][incr_top_left_file - 1] != 0))
                     
                     self.generate_base_moves(board, move_list, capture_list, self.top_left, 
                                              (incr_top_left_rank - 1, incr_top_left_file - 1))
@@ -671,8 +676,8 @@ class Bishop(GenerateMoves):
                 for incr_bottom_right_rank in range(self.rank, 8, +1):
                     
                     self.bottom_right = ((incr_bottom_right_rank < BOTTOM and incr_bottom_right_file < RIGHT) and
-                                        (self.board[incr_bottom_right_rank + 1][incr_bottom_right_file + 1] == 0 or
-                                        self.board[incr_bottom_right_rank + 1][incr_bottom_right_file + 1] != 0))
+                                        (board[incr_bottom_right_rank + 1][incr_bottom_right_file + 1] == 0 or
+                                        board[incr_bottom_right_rank + 1][incr_bottom_right_file + 1] != 0))
                     
                     self.generate_base_moves(board, move_list, capture_list, self.bottom_right, 
                                              (incr_bottom_right_rank + 1, incr_bottom_right_file + 1))
@@ -687,8 +692,8 @@ class Bishop(GenerateMoves):
                 for incr_bottom_left_rank in range(self.rank, 8, +1):
                     
                     self.bottom_left = ((incr_bottom_left_rank < BOTTOM and incr_bottom_left_file > LEFT) and
-                                        (self.board[incr_bottom_left_rank + 1][incr_bottom_left_file - 1] == 0 or
-                                        self.board[incr_bottom_left_rank + 1][incr_bottom_left_file - 1] != 0))
+                                        (board[incr_bottom_left_rank + 1][incr_bottom_left_file - 1] == 0 or
+                                        board[incr_bottom_left_rank + 1][incr_bottom_left_file - 1] != 0))
                     
                     self.generate_base_moves(board, move_list, capture_list, self.bottom_left, 
                                              (incr_bottom_left_rank + 1, incr_bottom_left_file - 1))
@@ -711,8 +716,8 @@ class Bishop(GenerateMoves):
                 for incr_top_right_rank in range(self.rank, 8, +1):
                     
                     self.bottom_left = ((incr_top_right_rank < BOTTOM and incr_top_right_file > LEFT) and
-                                        (self.board[incr_top_right_rank + 1][incr_top_right_file - 1] == 0 or
-                                        self.board[incr_top_right_rank + 1][incr_top_right_file - 1] != 0))
+                                        (board[incr_top_right_rank + 1][incr_top_right_file - 1] == 0 or
+                                        board[incr_top_right_rank + 1][incr_top_right_file - 1] != 0))
                     
                     self.generate_base_moves(board, move_list, capture_list, self.bottom_left, 
                                              (incr_top_right_rank + 1, incr_top_right_file - 1))
@@ -727,8 +732,8 @@ class Bishop(GenerateMoves):
                 for incr_top_left_rank in range(self.rank, 8, +1):
                     
                     self.bottom_right = ((incr_top_left_rank < BOTTOM and incr_top_left_file < RIGHT) and
-                                        (self.board[incr_top_left_rank + 1][incr_top_left_file + 1] == 0 or
-                                        self.board[incr_top_left_rank + 1][incr_top_left_file + 1] != 0))
+                                        (board[incr_top_left_rank + 1][incr_top_left_file + 1] == 0 or
+                                        board[incr_top_left_rank + 1][incr_top_left_file + 1] != 0))
                     
                     self.generate_base_moves(board, move_list, capture_list, self.bottom_right, 
                                              (incr_top_left_rank + 1, incr_top_left_file + 1))
@@ -746,8 +751,8 @@ class Bishop(GenerateMoves):
                 for incr_bottom_right_rank in range(self.rank, 0, -1):
                     
                     self.top_left = ((incr_bottom_right_rank > TOP and incr_bottom_right_file > LEFT) and
-                                    (self.board[incr_bottom_right_rank - 1][incr_bottom_right_file - 1] == 0 or
-                                    self.board[incr_bottom_right_rank - 1][incr_bottom_right_file - 1] != 0))
+                                    (board[incr_bottom_right_rank - 1][incr_bottom_right_file - 1] == 0 or
+                                    board[incr_bottom_right_rank - 1][incr_bottom_right_file - 1] != 0))
                     
                     # Function call to generate base moves
                     self.generate_base_moves(board, move_list, capture_list, self.top_left, 
@@ -763,8 +768,8 @@ class Bishop(GenerateMoves):
                 for incr_bottom_left_rank in range(self.rank, 0, -1):
                     
                     self.top_right = ((incr_bottom_left_rank > TOP and incr_bottom_left_file < RIGHT) and
-                                    (self.board[incr_bottom_left_rank- 1][incr_bottom_left_file + 1] == 0 or
-                                    self.board[incr_bottom_left_rank - 1][incr_bottom_left_file + 1] != 0))
+                                    (board[incr_bottom_left_rank- 1][incr_bottom_left_file + 1] == 0 or
+                                    board[incr_bottom_left_rank - 1][incr_bottom_left_file + 1] != 0))
                     
                     # Function call to generate base moves
                     self.generate_base_moves(board, move_list, capture_list, self.top_right, 
@@ -785,6 +790,7 @@ class Bishop(GenerateMoves):
 
 
 class Pawn(GenerateMoves):
+    __slots__ = ()
     pc_idx = 7
     promoted_pc_idx = 5
 
@@ -805,7 +811,7 @@ class Pawn(GenerateMoves):
         match self.player:
 
             case 'sente':
-                self.move_boundaries()
+                self.move_boundaries(board)
                 
                 # If piece is promoted, use new move set
                 if self.token_promoted:
@@ -818,7 +824,7 @@ class Pawn(GenerateMoves):
                 return move_list, capture_list
 
             case 'gote':
-                self.move_boundaries()
+                self.move_boundaries(board)
 
                 # If piece is promoted, use new move set
                 if self.token_promoted:
@@ -0,0 +1,882 @@
+""" This is the 'position' module that holds the engine's view of a game. Pieces are kept as bitboards per player and
+per piece type, hands as plain counts, and moves as packed integers, so move generation never touches piece objects. """
+
+import random
+from array import array
+
+from constants import *
+from bitboards import *
+
+
+""" MOVE ENCODING. """
+# Bits 0-6 hold the destination square, bits 7-13 the origin square (or 81 + piece for drops), bit 14 promotion
+PROMOTE_FLAG = 1 << 14
+PROMOTABLE = (PAWN, LANCE, KNIGHT, SILVER, BISHOP, ROOK)
+UNPROMOTED = [piece - PROMOTED if piece > KING else piece for piece in range(PIECE_TYPES)]
+USI_PIECES = ' PLNSGBR'  # Letters of the droppable pieces, indexed by piece code
+
+
+def encode_move(from_sq: int, to_sq: int, promote: bool = False) -> int:
+    """ This function packs a board move into a single integer. """
+
+    return to_sq | from_sq << 7 | (PROMOTE_FLAG if promote else 0)
+
+
+def encode_drop(piece: int, to_sq: int) -> int:
+    """ This function packs a drop from the komadai into a single integer. """
+
+    return to_sq | (SQUARES + piece) << 7
+
+
+def move_to(move: int) -> int:
+    """ This function returns the destination square of a packed move. """
+
+    return move & 0x7F
+
+
+def move_from(move: int) -> int:
+    """ This function returns the origin square of a packed move (81 + piece for drops). """
+
+    return move >> 7 & 0x7F
+
+
+def is_drop(move: int) -> bool:
+    """ This function returns True if a packed move drops a piece from the komadai. """
+
+    return (move >> 7 & 0x7F) >= SQUARES
+
+
+def drop_piece(move: int) -> int:
+    """ This function returns the piece code dropped by a packed drop move. """
+
+    return (move >> 7 & 0x7F) - SQUARES
+
+
+def is_promotion(move: int) -> bool:
+    """ This function returns True if a packed move promotes the moving piece. """
+
+    return bool(move & PROMOTE_FLAG)
+
+
+def usi_notation(move: int) -> str:
+    """ This function writes a packed move in USI notation, such as 7g7f, 2b3c+ or P*5e. """
+
+    to_rank, to_file = divmod(move & 0x7F, 9)
+    to_text = f'{9 - to_file}{chr(ord("a") + to_rank)}'
+
+    if is_drop(move):
+        return f'{USI_PIECES[drop_piece(move)]}*{to_text}'
+
+    from_rank, from_file = divmod(move >> 7 & 0x7F, 9)
+    return f'{9 - from_file}{chr(ord("a") + from_rank)}{to_text}{"+" if move & PROMOTE_FLAG else ""}'
+
+
+""" ZOBRIST KEYS. """
+# Fixed seed, so every process (and every run) agrees on the key of a position
+_zobrist = random.Random(0x5E17E)
+
+PIECE_KEYS = [[[_zobrist.getrandbits(64) for _ in range(SQUARES)] for _ in range(PIECE_TYPES)] for _ in PLAYERS]
+HAND_KEYS = [[[0] + [_zobrist.getrandbits(64) for _ in range(18)] for _ in range(KING + 1)] for _ in PLAYERS]
+SIDE_KEY = _zobrist.getrandbits(64)  # Mixed in while gote is to move
+
+
+class Position:
+
+    __slots__ = ('pieces', 'occupied', 'lines', 'squares', 'hands', 'pawn_files', 'king_squares', 'side', 'key',
+                 'attacks', 'attackers')
+
+    def __init__(self) -> None:
+        self.pieces = [[0] * PIECE_TYPES for _ in PLAYERS]  # Bitboard for every piece type of each player
+        self.occupied = [0, 0]  # Bitboard of every square held by each player
+        self.lines = [0, 0, 0, 0]  # Occupancy of both players in each rotated layout, used by the sliding tables
+        self.squares = array('b', bytes(SQUARES))  # Signed piece code on each square, negative for gote
+        self.hands = [[0] * (KING + 1) for _ in PLAYERS]  # Komadai counts indexed by piece code
+        self.pawn_files = [0, 0]  # 9-bit mask of the files holding an unpromoted pawn of each player
+        self.king_squares = [None, None]  # Square of each player's king, None while it is off the board
+        self.side = SENTE
+        self.key = 0  # 64-bit Zobrist key of the board, hands and side to move
+
+        # Attack maps kept up to date by put_piece and remove_piece, counting squares held by either side as attacked
+        self.attacks = [0] * SQUARES  # Squares attacked by the piece standing on each square
+        self.attackers = [0] * SQUARES  # Squares of every piece, of either player, attacking each square
+
+
+    @classmethod
+    def from_board(cls, board: list, captured_pieces: dict, current_player: str = 'sente') -> 'Position':
+        """ This function builds a position from a board array of piece objects and the komadai counts. """
+
+        position = cls()
+        position.side = PLAYERS.index(current_player)
+
+        for rank in range(9):
+            for file in range(9):
+                piece = board[rank][file]
+
+                if piece != 0:
+                    code = PIECE_CODES[str(piece)]
+                    if piece.token_promoted and code in PROMOTABLE:
+                        code += PROMOTED
+
+                    position.put_piece(PLAYERS.index(piece.player), code, square(rank, file))
+
+        for player, counts in captured_pieces.items():
+            for piece in HAND_TYPES:
+                position.hands[PLAYERS.index(player)][piece] = counts[piece]
+
+        position.key = position.compute_key()
+        return position
+
+
+    @classmethod
+    def initial(cls) -> 'Position':
+        """ This function returns the standard starting position. """
+
+        starting_board = Board()
+        return cls.from_board(starting_board.board, starting_board.captured_pieces)
+
+
+    def serialize(self) -> bytes:
+        """ This function packs the position into 96 bytes (signed square codes, both komadai and the side to move),
+            small enough to send to another process with every task. """
+
+        hands = [self.hands[player][piece] for player in (SENTE, GOTE) for piece in HAND_TYPES]
+        return self.squares.tobytes() + bytes(hands) + bytes([self.side])
+
+
+    @classmethod
+    def deserialize(cls, data: bytes) -> 'Position':
+        """ This function rebuilds a position packed by serialize. """
+
+        position = cls()
+
+        for sq, code in enumerate(array('b', data[:SQUARES])):
+            if code:
+                position.put_piece(SENTE if code > 0 else GOTE, abs(code), sq)
+
+        for idx, piece in enumerate(HAND_TYPES):
+            position.hands[SENTE][piece] = data[SQUARES + idx]
+            position.hands[GOTE][piece] = data[SQUARES + len(HAND_TYPES) + idx]
+
+        position.side = data[SQUARES + 2 * len(HAND_TYPES)]
+        position.key = position.compute_key()
+        return position
+
+
+    def __reduce__(self) -> tuple:
+        """ This function makes a pickled position carry only its 96 serialized bytes, so positions stored or sent to
+            another process stay small. The bitboards, attack maps and key are rebuilt from them when unpickled. """
+
+        return Position.deserialize, (self.serialize(),)
+
+
+    def copy(self) -> 'Position':
+        """ This function returns an independent working copy of the position, attack maps included, for code that
+            goes on to play moves on it. The lists are sliced rather than rebuilt, which is about ten times faster than
+            a deserialize, but the copy is about 7 KB; a position that is only kept should be kept serialized. """
+
+        position = Position.__new__(Position)
+        position.pieces = [self.pieces[SENTE][:], self.pieces[GOTE][:]]
+        position.occupied = self.occupied[:]
+        position.lines = self.lines[:]
+        position.squares = self.squares[:]
+        position.hands = [self.hands[SENTE][:], self.hands[GOTE][:]]
+        position.pawn_files = self.pawn_files[:]
+        position.king_squares = self.king_squares[:]
+        position.side = self.side
+        position.key = self.key
+        position.attacks = self.attacks[:]
+        position.attackers = self.attackers[:]
+        return position
+
+
+    def put_piece(self, player: int, piece: int, sq: int) -> None:
+        """ This function places a piece of a player onto an empty square. """
+
+        bit = SQUARE_BB[sq]
+        self.pieces[player][piece] |= bit
+        self.occupied[player] |= bit
+        self.squares[sq] = piece if player == SENTE else -piece
+        self.key ^= PIECE_KEYS[player][piece][sq]
+
+        if piece == PAWN:
+            self.pawn_files[player] |= 1 << sq % 9
+        elif piece == KING:
+            self.king_squares[player] = sq
+
+        lines = self.lines
+        lines[RANK_LINE] |= bit
+        lines[FILE_LINE] |= LINE_BB[FILE_LINE][sq]
+        lines[DIAG_LINE] |= LINE_BB[DIAG_LINE][sq]
+        lines[ANTI_LINE] |= LINE_BB[ANTI_LINE][sq]
+
+        # Sliders that reached through the square are now blocked on it, and the new piece adds its own attacks
+        attackers = self.attackers
+        self.refresh_sliders(attackers[sq])
+
+        attacks = attacks_from(player, piece, sq, lines)
+        self.attacks[sq] = attacks
+
+        while attacks:
+            lsb = attacks & -attacks
+            attackers[lsb.bit_length() - 1] |= bit
+            attacks ^= lsb
+
+
+    def remove_piece(self, sq: int) -> int:
+        """ This function lifts the piece off a square and returns its signed code. """
+
+        code = self.squares[sq]
+        player, piece = (SENTE, code) if code > 0 else (GOTE, -code)
+
+        bit = SQUARE_BB[sq]
+        self.pieces[player][piece] ^= bit
+        self.occupied[player] ^= bit
+        self.squares[sq] = 0
+        self.key ^= PIECE_KEYS[player][piece][sq]
+
+        if piece == PAWN:
+            self.pawn_files[player] ^= 1 << sq % 9
+        elif piece == KING:
+            self.king_squares[player] = None
+
+        lines = self.lines
+        lines[RANK_LINE] ^= bit
+        lines[FILE_LINE] ^= LINE_BB[FILE_LINE][sq]
+        lines[DIAG_LINE] ^= LINE_BB[DIAG_LINE][sq]
+        lines[ANTI_LINE] ^= LINE_BB[ANTI_LINE][sq]
+
+        # The piece's attacks go with it, and sliders that were blocked on the square now reach through it
+        attackers = self.attackers
+        attacks = self.attacks[sq]
+        self.attacks[sq] = 0
+
+        while attacks:
+            lsb = attacks & -attacks
+            attackers[lsb.bit_length() - 1] ^= bit
+            attacks ^= lsb
+
+        self.refresh_sliders(attackers[sq])
+
+        return code
+
+
+    def refresh_sliders(self, pieces: int) -> None:
+        """ This function recomputes the attacks of the sliders among some pieces after the occupancy changed, and
+            updates the attack map on the squares they gained or lost. """
+
+        squares, attackers = self.squares, self.attackers
+
+        while pieces:
+            lsb = pieces & -pieces
+            sq = lsb.bit_length() - 1
+            pieces ^= lsb
+
+            code = squares[sq]
+            piece = abs(code)
+            if piece not in SLIDERS:
+                continue
+
+            attacks = slider_attacks(SENTE if code > 0 else GOTE, piece, sq, self.lines)
+            changed = attacks ^ self.attacks[sq]
+            self.attacks[sq] = attacks
+
+            while changed:
+                changed_lsb = changed & -changed
+                attackers[changed_lsb.bit_length() - 1] ^= lsb
+                changed ^= changed_lsb
+
+
+    def add_to_hand(self, player: int, piece: int) -> None:
+        """ This function pushes a piece onto a player's komadai. """
+
+        count = self.hands[player][piece]
+        self.hands[player][piece] = count + 1
+        self.key ^= HAND_KEYS[player][piece][count] ^ HAND_KEYS[player][piece][count + 1]
+
+
+    def take_from_hand(self, player: int, piece: int) -> None:
+        """ This function pops a piece off a player's komadai. """
+
+        count = self.hands[player][piece]
+        self.hands[player][piece] = count - 1
+        self.key ^= HAND_KEYS[player][piece][count] ^ HAND_KEYS[player][piece][count - 1]
+
+
+    def compute_key(self) -> int:
+        """ This function computes the Zobrist key from scratch, used to set up and to verify the incremental key. """
+
+        key = SIDE_KEY if self.side == GOTE else 0
+
+        for sq, code in enumerate(self.squares):
+            if code > 0:
+                key ^= PIECE_KEYS[SENTE][code][sq]
+            elif code < 0:
+                key ^= PIECE_KEYS[GOTE][-code][sq]
+
+        for player in (SENTE, GOTE):
+            for piece in HAND_TYPES:
+                key ^= HAND_KEYS[player][piece][self.hands[player][piece]]
+
+        return key
+
+
+    def set_side(self, player: int) -> None:
+        """ This function hands the turn to a player without making a move. """
+
+        if player != self.side:
+            self.side = player
+            self.key ^= SIDE_KEY
+
+
+    def make_move(self, move: int) -> int:
+        """ This function plays a packed move and returns the undo information needed to take it back. """
+
+        player = self.side
+        to_sq = move & 0x7F
+        from_sq = move >> 7 & 0x7F
+        captured = 0
+
+        if from_sq >= SQUARES:
+            # Drops move a piece from the komadai onto an empty square
+            piece = from_sq - SQUARES
+            self.take_from_hand(player, piece)
+            self.put_piece(player, piece, to_sq)
+
+        else:
+            piece = abs(self.remove_piece(from_sq))
+
+            # A captured piece loses its promotion and goes onto the mover's komadai
+            if self.squares[to_sq] != 0:
+                captured = abs(self.remove_piece(to_sq))
+                self.add_to_hand(player, UNPROMOTED[captured])
+
+            if move & PROMOTE_FLAG:
+                piece += PROMOTED
+
+            self.put_piece(player, piece, to_sq)
+
+        self.side = player ^ 1
+        self.key ^= SIDE_KEY
+        return move | captured << 16
+
+
+    def unmake_move(self, undo: int) -> None:
+        """ This function takes back the move described by the undo information returned from make_move. """
+
+        player = self.side ^ 1
+        to_sq = undo & 0x7F
+        from_sq = undo >> 7 & 0x7F
+        captured = undo >> 16
+
+        self.side = player
+        self.key ^= SIDE_KEY
+
+        if from_sq >= SQUARES:
+            self.remove_piece(to_sq)
+            self.add_to_hand(player, from_sq - SQUARES)
+            return
+
+        piece = abs(self.remove_piece(to_sq))
+        if undo & PROMOTE_FLAG:
+            piece -= PROMOTED
+
+        self.put_piece(player, piece, from_sq)
+
+        # The captured piece is returned to the board with its promotion intact
+        if captured:
+            self.take_from_hand(player, UNPROMOTED[captured])
+            self.put_piece(player ^ 1, captured, to_sq)
+
+
+    def attackers_to(self, sq: int, player: int) -> int:
+        """ This function returns the bitboard of every piece of a player that attacks a square, read from the map. """
+
+        return self.attackers[sq] & self.occupied[player]
+
+
+    def attack_count(self, sq: int, player: int) -> int:
+        """ This function returns how many pieces of a player attack a square. """
+
+        return (self.attackers[sq] & self.occupied[player]).bit_count()
+
+
+    def compute_attackers(self, sq: int, player: int) -> int:
+        """ This function finds the pieces of a player attacking a square from the attack tables and the current line
+            occupancy, for squares looked at with a piece lifted off the board, which the attack map does not reflect. """
+
+        pieces = self.pieces[player]
+        lines = self.lines
+        opponent = player ^ 1  # Attacks are traced backwards, so the tables are read from the other side
+
+        golds = pieces[GOLD] | pieces[PRO_PAWN] | pieces[PRO_LANCE] | pieces[PRO_KNIGHT] | pieces[PRO_SILVER]
+
+        return ((STEP_ATTACKS[opponent][PAWN][sq] & pieces[PAWN])
+                | (STEP_ATTACKS[opponent][KNIGHT][sq] & pieces[KNIGHT])
+                | (STEP_ATTACKS[opponent][SILVER][sq] & pieces[SILVER])
+                | (STEP_ATTACKS[opponent][GOLD][sq] & golds)
+                | (STEP_ATTACKS[opponent][KING][sq] & (pieces[KING] | pieces[HORSE] | pieces[DRAGON]))
+                | (slider_attacks(opponent, LANCE, sq, lines) & pieces[LANCE])
+                | (slider_attacks(opponent, ROOK, sq, lines) & (pieces[ROOK] | pieces[DRAGON]))
+                | (slider_attacks(opponent, BISHOP, sq, lines) & (pieces[BISHOP] | pieces[HORSE])))
+
+
+    def in_check(self, player: int) -> bool:
+        """ This function returns True if the king of a player is attacked. """
+
+        king_sq = self.king_squares[player]
+        return king_sq is not None and self.attackers_to(king_sq, player ^ 1) != 0
+
+
+    def is_legal(self, move: int) -> bool:
+        """ This function returns True if a generated move does not leave the mover's own king in check. """
+
+        player = self.side
+        undo = self.make_move(move)
+        legal = not self.in_check(player)
+        self.unmake_move(undo)
+
+        return legal
+
+
+    def legal_moves(self) -> list[int]:
+        """ This function returns every move of the player to move that does not leave their king in check. """
+
+        return self.generate_legal()
+
+
+    def pins(self, player: int) -> dict[int, int]:
+        """ This function finds the pieces of a player pinned to their king. Each pinned square maps to the squares
+            it may still move to, the line between the king and the pinning piece along with that piece itself. """
+
+        return self.line_blockers(player, player)
+
+
+    def discoverers(self, player: int) -> dict[int, int]:
+        """ This function finds the pieces of a player that alone shield the opponent's king from one of the player's
+            sliders, each mapped to the line it would have to stay on for the check not to be uncovered. """
+
+        return self.line_blockers(player ^ 1, player)
+
+
+    def line_blockers(self, king_player: int, player: int) -> dict[int, int]:
+        """ This function maps every piece of a player that is the only piece between a king and an enemy slider
+            aiming at it to the line between the two, the slider's square included. """
+
+        blocking = {}
+        king_sq = self.king_squares[king_player]
+        if king_sq is None:
+            return blocking
+
+        enemy = self.pieces[king_player ^ 1]
+        empty_lines = [0, 0, 0, 0]
+
+        # Enemy sliders that would attack the king on an empty board, read from the king's side
+        snipers = ((attacks_from(king_player, LANCE, king_sq, empty_lines) & enemy[LANCE])
+                   | (attacks_from(king_player, ROOK, king_sq, empty_lines) & (enemy[ROOK] | enemy[DRAGON]))
+                   | (attacks_from(king_player, BISHOP, king_sq, empty_lines) & (enemy[BISHOP] | enemy[HORSE])))
+        occupied = self.occupied[SENTE] | self.occupied[GOTE]
+
+        for sniper in square_bits(snipers):
+            blockers = BETWEEN_BB[king_sq][sniper] & occupied
+
+            # Only a single blocker of the given player counts
+            if blockers and not blockers & (blockers - 1) and blockers & self.occupied[player]:
+                blocking[blockers.bit_length() - 1] = BETWEEN_BB[king_sq][sniper] | SQUARE_BB[sniper]
+
+        return blocking
+
+
+    def gives_check(self, move: int, discoverers: dict = None) -> bool:
+        """ This function returns True if a legal move of the player to move checks the opponent, without playing it.
+            The moved piece may check from its new square or uncover a slider; the discovering pieces can be passed
+            in when many moves of one position are tested. """
+
+        player = self.side
+        king_sq = self.king_squares[player ^ 1]
+        if king_sq is None:
+            return False
+
+        to_sq = move & 0x7F
+        from_sq = move >> 7 & 0x7F
+
+        if from_sq >= SQUARES:
+            return attacks_from(player ^ 1, from_sq - SQUARES, king_sq, self.lines) & SQUARE_BB[to_sq] != 0
+
+        if discoverers is None:
+            discoverers = self.discoverers(player)
+
+        if from_sq in discoverers and not discoverers[from_sq] & SQUARE_BB[to_sq]:
+            return True
+
+        piece = abs(self.squares[from_sq]) + (PROMOTED if move & PROMOTE_FLAG else 0)
+        lines = self.lines
+
+        # A slider's check is traced with its old square already empty
+        if piece in SLIDERS:
+            lines = [lines[kind] ^ LINE_BB[kind][from_sq] for kind in range(len(LINES))]
+
+        return attacks_from(player ^ 1, piece, king_sq, lines) & SQUARE_BB[to_sq] != 0
+
+
+    def key_after(self, move: int) -> int:
+        """ This function returns the Zobrist key of the position a move leads to, without playing it. """
+
+        player = self.side
+        to_sq = move & 0x7F
+        from_sq = move >> 7 & 0x7F
+        key = self.key ^ SIDE_KEY
+
+        if from_sq >= SQUARES:
+            piece = from_sq - SQUARES
+            count = self.hands[player][piece]
+            key ^= HAND_KEYS[player][piece][count] ^ HAND_KEYS[player][piece][count - 1]
+            return key ^ PIECE_KEYS[player][piece][to_sq]
+
+        piece = abs(self.squares[from_sq])
+        key ^= PIECE_KEYS[player][piece][from_sq]
+
+        captured = abs(self.squares[to_sq])
+        if captured:
+            count = self.hands[player][UNPROMOTED[captured]]
+            key ^= PIECE_KEYS[player ^ 1][captured][to_sq]
+            key ^= HAND_KEYS[player][UNPROMOTED[captured]][count] ^ HAND_KEYS[player][UNPROMOTED[captured]][count + 1]
+
+        if move & PROMOTE_FLAG:
+            piece += PROMOTED
+
+        return key ^ PIECE_KEYS[player][piece][to_sq]
+
+
+    def generate_legal(self, drop_filter: int = FULL_BB) -> list[int]:
+        """ This function generates only the legal moves of the player to move. Checkers and pinned pieces are found
+            first, so in check only evasions are built: king moves, captures of the checker and interpositions,
+            drops included. No move has to be played to be tested. Drops can be kept to the squares of a filter. """
+
+        player = self.side
+        king_sq = self.king_squares[player]
+        if king_sq is None:
+            return self.generate_moves()
+
+        moves = []
+        self.generate_king_moves(moves, king_sq)
+
+        # In double check only the king can move
+        move_mask, drop_mask = self.evasion_masks()
+        if move_mask:
+            self.generate_piece_moves(moves, move_mask, self.pins(player))
+            self.generate_drops(moves, drop_mask & drop_filter)
+
+        return moves
+
+
+    def has_legal_move(self) -> bool:
+        """ This function returns True as soon as one legal move or drop of the player to move is found. Without one
+            the player has lost, by checkmate when in check, and no move list is ever built to find out. """
+
+        player = self.side
+        own = self.occupied[player]
+        king_sq = self.king_squares[player]
+
+        if king_sq is not None:
+            moves = []
+            self.generate_king_moves(moves, king_sq)
+
+            if moves:
+                return True
+
+        move_mask, drop_mask = self.evasion_masks()
+        if not move_mask:
+            return False
+
+        # Any target of a piece is a legal move, a dead square can always be reached by promoting
+        pins = self.pins(player)
+        for sq in square_bits(own & ~self.pieces[player][KING]):
+            if self.piece_targets(sq) & move_mask & pins.get(sq, FULL_BB):
+                return True
+
+        empty = drop_mask & ~(self.occupied[SENTE] | self.occupied[GOTE])
+        hand = self.hands[player]
+
+        return any(hand[piece] and self.drop_targets(piece, empty) for piece in HAND_TYPES)
+
+
+    def is_checkmate(self) -> bool:
+        """ This function returns True if the player to move is in check with no legal move left. """
+
+        return self.in_check(self.side) and not self.has_legal_move()
+
+
+    def evasion_masks(self) -> tuple[int, int]:
+        """ This function returns the squares the pieces other than the king may move to and drop on. In check these
+            are the checker and the squares between it and the king, in double check there are none. """
+
+        player = self.side
+        king_sq = self.king_squares[player]
+        if king_sq is None:
+            return FULL_BB & ~self.occupied[player], FULL_BB
+
+        checkers = self.attackers_to(king_sq, player ^ 1)
+
+        if not checkers:
+            return FULL_BB & ~self.occupied[player], FULL_BB
+
+        if checkers & (checkers - 1):
+            return 0, 0
+
+        between = BETWEEN_BB[king_sq][checkers.bit_length() - 1]
+        return checkers | between, between
+
+
+    def generate_king_moves(self, moves: list[int], king_sq: int) -> None:
+        """ This function appends the king moves of the player to move onto squares the opponent does not attack. """
+
+        player = self.side
+        lines = self.lines
+        targets = STEP_ATTACKS[player][KING][king_sq] & ~self.occupied[player]
+
+        # The king is lifted off the board while its targets are tested, so it cannot hide behind itself from a slider
+        for kind in range(len(LINES)):
+            lines[kind] ^= LINE_BB[kind][king_sq]
+
+        moves.extend(to_sq | king_sq << 7 for to_sq in square_bits(targets) if not self.compute_attackers(to_sq, player ^ 1))
+
+        for kind in range(len(LINES)):
+            lines[kind] ^= LINE_BB[kind][king_sq]
+
+
+    def legal_targets(self, sq: int) -> int:
+        """ This function returns the bitboard of squares the piece of the player to move on a square can legally
+            move to, found with the same checks and pins as the legal generator. """
+
+        code = self.squares[sq]
+        if code == 0 or (code > 0) != (self.side == SENTE):
+            return 0
+
+        if abs(code) == KING:
+            moves = []
+            self.generate_king_moves(moves, sq)
+            return sum(SQUARE_BB[move & 0x7F] for move in moves)
+
+        return self.piece_targets(sq) & self.evasion_masks()[0] & self.pins(self.side).get(sq, FULL_BB)
+
+
+    def piece_targets(self, sq: int) -> int:
+        """ This function returns the bitboard of squares the piece on a square can move to, ignoring checks. """
+
+        code = self.squares[sq]
+        player, piece = (SENTE, code) if code > 0 else (GOTE, -code)
+
+        return attacks_from(player, piece, sq, self.lines) & ~self.occupied[player]
+
+
+    def move_set(self, rank: int, file: int) -> list[tuple]:
+        """ This function returns the moves of the piece on a square in the (file, rank) form of generate_move_list. """
+
+        return [(to_sq % 9, to_sq // 9) for to_sq in square_bits(self.piece_targets(square(rank, file)))]
+
+
+    def generate_moves(self) -> list[int]:
+        """ This function generates every board move and drop for the player to move, ignoring checks. """
+
+        moves = []
+        self.generate_piece_moves(moves, FULL_BB & ~self.occupied[self.side])
+        self.generate_drops(moves)
+
+        return moves
+
+
+    def generate_captures(self) -> list[int]:
+        """ This function generates only the board moves that capture an opponent's piece, for the quiescence search.
+            Only the targets on opponent squares are expanded, so the quiet moves are never built. """
+
+        moves = []
+        self.generate_piece_moves(moves, self.occupied[self.side ^ 1])
+
+        return moves
+
+
+    def generate_quiets(self) -> list[int]:
+        """ This function generates the board moves onto empty squares and every drop, the moves that capture nothing. """
+
+        moves = []
+        self.generate_piece_moves(moves, FULL_BB & ~(self.occupied[SENTE] | self.occupied[GOTE]))
+        self.generate_drops(moves)
+
+        return moves
+
+
+    def generate_piece_moves(self, moves: list[int], mask: int, pins: dict = None) -> None:
+        """ This function appends the board moves of the player to move whose destination lies within a mask. When
+            pins are given, the king is left to the caller and every pinned piece stays on its pin line. """
+
+        player = self.side
+        lines = self.lines
+        zone = PROMOTION_ZONE[player]
+
+        for piece in range(1, PIECE_TYPES):
+            pieces = self.pieces[player][piece] if pins is None or piece != KING else 0
+
+            while pieces:
+                lsb = pieces & -pieces
+                from_sq = lsb.bit_length() - 1
+                pieces ^= lsb
+
+                targets = attacks_from(player, piece, from_sq, lines) & mask
+                if pins and from_sq in pins:
+                    targets &= pins[from_sq]
+
+                if not targets:
+                    continue
+
+                if piece not in PROMOTABLE:
+                    moves.extend(to_sq | from_sq << 7 for to_sq in square_bits(targets))
+                    continue
+
+                # Moves that start or end inside the promotion zone may promote, dead squares must promote
+                promotions = targets if lsb & zone else targets & zone
+                dead = DEAD_SQUARES[player][piece]
+
+                moves.extend(to_sq | from_sq << 7 | PROMOTE_FLAG for to_sq in square_bits(promotions))
+                moves.extend(to_sq | from_sq << 7 for to_sq in square_bits(targets & ~dead))
+
+
+    def is_pseudo_legal(self, move: int) -> bool:
+        """ This function returns True if a packed move could have been generated in this position, ignoring checks.
+            Hash and killer moves come from other positions, so they are checked before being played. """
+
+        player = self.side
+        to_sq = move & 0x7F
+        from_sq = move >> 7 & 0x7F
+
+        # Moves from the tables may be garbage, so the destination is checked to be on the board before it is used
+        if move == 0 or move >> 15 or to_sq >= SQUARES:
+            return False
+
+        to_bit = SQUARE_BB[to_sq]
+        if self.occupied[player] & to_bit:
+            return False
+
+        if from_sq >= SQUARES:
+            piece = from_sq - SQUARES
+
+            if move & PROMOTE_FLAG or piece not in HAND_TYPES or self.hands[player][piece] == 0:
+                return False
+
+            # Drops go through the generator's own rules: dead ranks, nifu and uchifuzume
+            return self.drop_targets(piece, to_bit & ~self.occupied[player ^ 1]) != 0
+
+        code = self.squares[from_sq]
+        if code == 0 or (code > 0) != (player == SENTE):
+            return False
+
+        piece = abs(code)
+        if not attacks_from(player, piece, from_sq, self.lines) & to_bit:
+            return False
+
+        if move & PROMOTE_FLAG:
+            return piece in PROMOTABLE and bool((SQUARE_BB[from_sq] | to_bit) & PROMOTION_ZONE[player])
+
+        return not DEAD_SQUARES[player][piece] & to_bit
+
+
+    def generate_checks(self) -> list[int]:
+        """ This function generates the quiet board moves and drops that attack the opponent's king directly.
+            Check squares are traced backwards from the king, so discovered checks are not included. """
+
+        moves = []
+        player = self.side
+        king_sq = self.king_squares[player ^ 1]
+        if king_sq is None:
+            return moves
+
+        lines = self.lines
+        zone = PROMOTION_ZONE[player]
+        empty = FULL_BB & ~(self.occupied[SENTE] | self.occupied[GOTE])
+
+        # Squares from which each piece type of the player would attack the king, read from the king's side
+        check_squares = [0] * PIECE_TYPES
+        for piece in range(1, PIECE_TYPES):
+            if piece != KING:
+                check_squares[piece] = attacks_from(player ^ 1, piece, king_sq, lines) & empty
+
+        for piece in range(1, PIECE_TYPES):
+            pieces = self.pieces[player][piece] if piece != KING else 0
+
+            while pieces:
+                lsb = pieces & -pieces
+                from_sq = lsb.bit_length() - 1
+                pieces ^= lsb
+
+                targets = attacks_from(player, piece, from_sq, lines) & empty
+                checks = check_squares
+
+                # A slider that blocks its own line to the king can still check from beyond its square
+                if piece in SLIDERS and attacks_from(player ^ 1, piece, king_sq, lines) & lsb:
+                    vacated = [lines[kind] ^ LINE_BB[kind][from_sq] for kind in range(len(LINES))]
+                    checks = check_squares[:]
+                    for kind in (piece, piece + PROMOTED if piece in PROMOTABLE else piece):
+                        checks[kind] = attacks_from(player ^ 1, kind, king_sq, vacated) & (empty | lsb)
+
+                if piece not in PROMOTABLE:
+                    moves.extend(to_sq | from_sq << 7 for to_sq in square_bits(targets & checks[piece]))
+                    continue
+
+                promotions = (targets if lsb & zone else targets & zone) & checks[piece + PROMOTED]
+                moves.extend(to_sq | from_sq << 7 | PROMOTE_FLAG for to_sq in square_bits(promotions))
+                moves.extend(to_sq | from_sq << 7 for to_sq in
+                             square_bits(targets & checks[piece] & ~DEAD_SQUARES[player][piece]))
+
+        # Checking drops go through the drop rules like any other, nifu and uchifuzume included
+        hand = self.hands[player]
+        for piece in HAND_TYPES:
+            if hand[piece]:
+                moves.extend(to_sq | (SQUARES + piece) << 7 for to_sq in
+                             square_bits(self.drop_targets(piece, check_squares[piece])))
+
+        return moves
+
+
+    def generate_drops(self, moves: list[int], mask: int = FULL_BB) -> None:
+        """ This function appends every legal drop of the player to move onto an empty square within a mask. """
+
+        hand = self.hands[self.side]
+        empty = mask & ~(self.occupied[SENTE] | self.occupied[GOTE])
+
+        for piece in HAND_TYPES:
+            if hand[piece]:
+                moves.extend(to_sq | (SQUARES + piece) << 7 for to_sq in square_bits(self.drop_targets(piece, empty)))
+
+
+    def drop_targets(self, piece: int, empty: int) -> int:
+        """ This function returns the squares among some empty ones that the player to move may drop a piece type on.
+            Pieces are kept off the ranks where they could never move again, and pawns off the files holding one of
+            the player's pawns (nifu) and off the square in front of the opponent's king when that would mate. """
+
+        player = self.side
+        targets = empty & ~DEAD_SQUARES[player][piece]
+
+        if piece != PAWN:
+            return targets
+
+        targets &= ~NIFU_FILES[self.pawn_files[player]]
+
+        # Uchifuzume: a dropped pawn can only check from the square in front of the king, and may not mate from it
+        king_sq = self.king_squares[player ^ 1]
+        if king_sq is not None:
+            front = STEP_ATTACKS[player ^ 1][PAWN][king_sq] & targets
+            if front and self.pawn_drop_mates(front.bit_length() - 1):
+                targets ^= front
+
+        return targets
+
+
+    def pawn_drop_mates(self, sq: int) -> bool:
+        """ This function returns True if dropping a pawn of the player to move on a square checkmates the opponent. """
+
+        undo = self.make_move((SQUARES + PAWN) << 7 | sq)
+        mates = self.in_check(self.side) and not self.has_legal_move()
+        self.unmake_move(undo)
+
+        return mates
+
+from board import Board
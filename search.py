@@ -0,0 +1,581 @@
+""" This is the 'search' module that holds the computer opponent. It runs a negamax alpha-beta search over the engine
+position, backed by the transposition table, and returns the best move it finds within a node or time budget. """
+
+import time
+
+from constants import *
+from bitboards import SQUARES, STEP_ATTACKS, square_bits
+from position import Position, is_drop, PROMOTE_FLAG
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+
+""" SCORES. """
+MATE = 30000  # Score for delivering checkmate, reduced by the number of plies it takes
+INFINITE = 32000
+MATE_BOUND = MATE - 1000  # Scores beyond this are mates, which are stored in the table relative to the node
+MAX_PLY = 64
+
+""" QUIESCENCE. """
+DELTA_MARGIN = 200  # Slack given to a capture's gain before delta pruning decides it cannot raise alpha
+QUIESCENCE_CHECK_PLIES = 1  # Quiet checks are tried on this many of the first quiescence plies when enabled
+
+""" MOVE ORDERING. """
+KILLER_SLOTS = 2  # Quiet moves remembered per ply for causing a cutoff
+HISTORY_LIMIT = 1 << 20  # History scores are halved once one of them grows past this
+
+""" WINDOWS. """
+ASPIRATION_WINDOW = 50  # Half width of the first root window around the previous iteration's score
+ASPIRATION_MIN_DEPTH = 4  # First iteration searched with an aspiration window
+ASPIRATION_WIDENING = 4  # Factor by which the failed side of the window grows on each re-search
+
+""" SELECTIVITY. """
+NULL_MOVE_REDUCTION = 2  # Extra plies taken off the depth of the null-move search
+NULL_MOVE_MIN_DEPTH = 3  # Shallowest remaining depth at which a null move is tried
+NULL_MOVE_HAND_LIMIT = 4  # Pieces in hand from which passing is no longer trusted, since every drop could be a threat
+LMR_MIN_DEPTH = 3  # Shallowest remaining depth at which late moves are reduced
+LMR_FULL_MOVES = 4  # Moves searched at full depth before reductions begin
+LMR_DEEP_MOVES = 12  # Moves after which the reduction grows by another ply
+
+""" TIME MANAGEMENT. """
+MOVES_TO_GO = 30  # Main time is shared out as if this many moves were still to be played
+STABLE_ITERATIONS = 3  # Iterations the best move must survive before the engine may stop early
+ITERATION_GROWTH = 4  # Rough factor by which each iteration outlasts the one before it
+
+# Material values indexed by piece code, promoted pieces are worth more on the board
+PIECE_VALUES = [0, 90, 315, 405, 495, 540, 855, 990, 0, 540, 540, 540, 540, 0, 945, 1395]
+HAND_VALUES = [0, 100, 350, 450, 550, 600, 950, 1100, 0]  # Pieces in hand can be dropped anywhere, so they count extra
+KING_ZONE_ATTACK = 15  # Penalty for each enemy attack on a square next to a player's king
+
+
+def evaluate(position: Position) -> int:
+    """ This function scores a position by material and king safety, from the point of view of the player to move. """
+
+    player = position.side
+    own, other = position.pieces[player], position.pieces[player ^ 1]
+    own_hand, other_hand = position.hands[player], position.hands[player ^ 1]
+    score = 0
+
+    for piece in range(1, PIECE_TYPES):
+        if PIECE_VALUES[piece]:
+            score += PIECE_VALUES[piece] * (own[piece].bit_count() - other[piece].bit_count())
+
+    for piece in HAND_TYPES:
+        score += HAND_VALUES[piece] * (own_hand[piece] - other_hand[piece])
+
+    # King safety: every attack the attack maps show on the squares around a king counts against its owner
+    for defender, sign in ((player, -1), (player ^ 1, 1)):
+        king_sq = position.king_squares[defender]
+
+        if king_sq is not None:
+            zone = STEP_ATTACKS[defender][KING][king_sq]
+            score += sign * KING_ZONE_ATTACK * sum(position.attack_count(sq, defender ^ 1) for sq in square_bits(zone))
+
+    return score
+
+
+def allocate_time(clock: float, in_byoyomi: bool, byoyomi: float = BYOYOMI) -> tuple[float, float]:
+    """ This function returns the soft and hard thinking time in seconds for the time left on a player's clock.
+        The soft limit is the target, and a new iteration is not started after it. The hard limit aborts the search. """
+
+    if in_byoyomi:
+        hard = max(clock - ENGINE_SAFETY, 0.2)
+        return hard / 2, hard
+
+    # In main time a share of the clock is spent, with byoyomi still to come once it runs out
+    soft = clock / MOVES_TO_GO + byoyomi / 2
+    hard = max(min(soft * 3, clock + byoyomi - ENGINE_SAFETY), soft)
+
+    return soft, hard
+
+
+def score_to_tt(score: int, ply: int) -> int:
+    """ This function turns a mate score counted from the root into one counted from the current node. """
+
+    if score >= MATE_BOUND:
+        return score + ply
+
+    if score <= -MATE_BOUND:
+        return score - ply
+
+    return score
+
+
+def score_from_tt(score: int, ply: int) -> int:
+    """ This function turns a stored mate score counted from its node back into one counted from the root. """
+
+    if score >= MATE_BOUND:
+        return score - ply
+
+    if score <= -MATE_BOUND:
+        return score + ply
+
+    return score
+
+
+class Search:
+
+    def __init__(self, tt_size_mb: int = 16, quiescence_checks: bool = False, null_move: bool = True,
+                 late_move_reductions: bool = True, tt: TranspositionTable = None) -> None:
+        self.tt = tt if tt is not None else TranspositionTable(tt_size_mb)
+        self.quiescence_checks = quiescence_checks
+        self.null_move = null_move  # Switches for the selective search, so each can be measured on its own
+        self.late_move_reductions = late_move_reductions
+        self.nodes = 0  # Nodes of the main search
+        self.qnodes = 0  # Nodes of the quiescence search, counted apart so each stage can be measured
+        self.max_nodes = None
+        self.deadline = None
+        self.stopped = False
+        self.stop_event = None  # Set by another process to stop a parallel search early
+
+        self.killers = [[0] * KILLER_SLOTS for _ in range(MAX_PLY + 1)]  # Quiet cutoff moves of each ply
+        self.history = [[[0] * SQUARES for _ in range(PIECE_TYPES)] for _ in PLAYERS]  # Indexed by player, piece, square
+
+        self.started = 0.0
+        self.best_move = 0  # Best move of the last finished iteration, always available while thinking
+        self.best_score = 0
+        self.depth = 0
+        self.pv = []  # Principal variation of the last finished iteration, read back from the table
+
+
+    def start(self, max_nodes: int = None, time_limit: float = None) -> None:
+        """ This function resets the counters and budget before a new search. """
+
+        self.nodes = 0
+        self.qnodes = 0
+        self.max_nodes = max_nodes
+        self.started = time.perf_counter()
+        self.deadline = self.started + time_limit if time_limit is not None else None
+        self.stopped = False
+        self.best_move, self.best_score, self.depth = 0, 0, 0
+        self.pv = []
+        self.tt.new_search()
+
+        # Killers belong to the previous position, the history is kept but weighted towards the new search
+        self.killers = [[0] * KILLER_SLOTS for _ in range(MAX_PLY + 1)]
+        self.age_history()
+
+
+    def search(self, position: Position, depth: int, max_nodes: int = None, time_limit: float = None) -> tuple[int, int]:
+        """ This function searches a position to a fixed depth and returns the best move and its score.
+            If the node or time budget runs out, the best move found so far is returned. """
+
+        self.start(max_nodes, time_limit)
+        return self.search_root(position, depth)
+
+
+    def think(self, position: Position, soft_limit: float, hard_limit: float, max_depth: int = MAX_PLY,
+              max_nodes: int = None, start_depth: int = 1) -> tuple[int, int]:
+        """ This function searches one ply deeper at a time until the time is used up and returns the best move and
+            its score. No iteration starts after the soft limit, and the hard limit aborts the running one. """
+
+        self.start(max_nodes, hard_limit)
+        stable = 0
+        iteration_started = self.started
+
+        # A lost position needs no search at all
+        if not position.has_legal_move():
+            self.best_score = -MATE
+            return 0, -MATE
+
+        for depth in range(start_depth, max_depth + 1):
+            move, score = self.aspiration_search(position, depth)
+
+            # An aborted iteration only counts if it already found a move, the previous best is always searched first
+            if move == 0:
+                if not self.stopped:
+                    self.best_score = score  # No legal move at all
+                break
+
+            stable = stable + 1 if move == self.best_move else 0
+            self.best_move, self.best_score = move, score
+
+            if self.stopped:
+                break
+
+            self.depth = depth
+            self.pv = self.principal_variation(position)
+            now = time.perf_counter()
+            elapsed = now - self.started
+            iteration_time, iteration_started = now - iteration_started, now
+
+            # A forced mate needs no deeper search
+            if abs(score) >= MATE_BOUND:
+                break
+
+            # Stop at the soft limit, or sooner once the best move has stopped changing
+            if elapsed >= soft_limit or (stable >= STABLE_ITERATIONS and elapsed >= soft_limit / 3):
+                break
+
+            # An iteration that would only be cut off by the hard limit is not worth starting
+            if elapsed + iteration_time * ITERATION_GROWTH >= hard_limit:
+                break
+
+        return self.best_move, self.best_score
+
+
+    def aspiration_search(self, position: Position, depth: int) -> tuple[int, int]:
+        """ This function searches the root in a narrow window around the previous iteration's score, widening the
+            side that failed until the score falls inside it. """
+
+        delta = ASPIRATION_WINDOW
+        alpha, beta = -INFINITE, INFINITE
+
+        # Shallow iterations are too unsteady to centre a window on, and mate scores jump between iterations
+        if depth >= ASPIRATION_MIN_DEPTH and abs(self.best_score) < MATE_BOUND:
+            alpha, beta = self.best_score - delta, self.best_score + delta
+
+        while True:
+            move, score = self.search_root(position, depth, alpha, beta)
+
+            if self.stopped:
+                return move, score
+
+            if score <= alpha and alpha > -INFINITE:
+                alpha, beta = max(score - delta, -INFINITE), (alpha + beta) // 2
+
+            elif score >= beta and beta < INFINITE:
+                beta = min(score + delta, INFINITE)
+
+            else:
+                return move, score
+
+            delta *= ASPIRATION_WIDENING
+
+
+    def search_root(self, position: Position, depth: int, alpha: int = -INFINITE,
+                    beta: int = INFINITE) -> tuple[int, int]:
+        """ This function searches every root move to a depth and returns the best one among those fully searched.
+            The first move gets the full window and the rest a zero window, re-searched only if they beat alpha. """
+
+        best_move, best_score = 0, -INFINITE
+        original_alpha = alpha
+        player = position.side
+
+        entry = self.tt.probe(position.key)
+        hash_move = entry[3] if entry is not None else 0
+
+        for move in self.pick_moves(position, hash_move, 0):
+            undo = position.make_move(move)
+
+            # Moves that leave the king in check are skipped
+            if position.in_check(player):
+                position.unmake_move(undo)
+                continue
+
+            if best_move == 0:
+                score = -self.alpha_beta(position, depth - 1, -beta, -alpha, 1)
+
+            else:
+                score = -self.alpha_beta(position, depth - 1, -alpha - 1, -alpha, 1)
+
+                if alpha < score < beta and not self.stopped:
+                    score = -self.alpha_beta(position, depth - 1, -beta, -alpha, 1)
+
+            position.unmake_move(undo)
+
+            # Results of a move that was cut off by the budget are incomplete and ignored
+            if self.stopped:
+                break
+
+            # After a fail low the later moves only bring upper bounds, so the first move stays the choice
+            if score > best_score and (best_move == 0 or score > alpha):
+                best_move, best_score = move, score
+                alpha = max(alpha, score)
+
+                if alpha >= beta:
+                    break
+
+        if best_move == 0 and not self.stopped:
+            best_score = -MATE  # No legal move, the player to move has been checkmated
+
+        elif best_move and not self.stopped:
+            bound = LOWER if best_score >= beta else UPPER if best_score <= original_alpha else EXACT
+            self.tt.store(position.key, depth, bound, best_score, best_move)
+
+        return best_move, best_score
+
+
+    def principal_variation(self, position: Position, max_length: int = MAX_PLY) -> list[int]:
+        """ This function follows the best moves stored in the transposition table from a position and returns them.
+            Every move is checked before it is played, since an entry may have been overwritten by another position. """
+
+        pv, undos, seen = [], [], set()
+
+        while len(pv) < max_length and position.key not in seen:
+            seen.add(position.key)
+            entry = self.tt.probe(position.key)
+
+            if entry is None or not position.is_pseudo_legal(entry[3]) or not position.is_legal(entry[3]):
+                break
+
+            pv.append(entry[3])
+            undos.append(position.make_move(entry[3]))
+
+        for undo in reversed(undos):
+            position.unmake_move(undo)
+
+        return pv
+
+
+    def out_of_budget(self) -> bool:
+        """ This function returns True once the node or time budget has been used up. """
+
+        if self.max_nodes is not None and self.nodes + self.qnodes >= self.max_nodes:
+            return True
+
+        if self.stop_event is not None and self.stop_event.is_set():
+            return True
+
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+
+    def pick_moves(self, position: Position, hash_move: int, ply: int):
+        """ This function yields the pseudo-legal moves in stages: the hash move, captures by MVV-LVA, the killers,
+            then the quiet moves by history. Each stage is only generated once the previous one has been searched,
+            so a cutoff early in the list never pays for the quiet moves. """
+
+        if hash_move and position.is_pseudo_legal(hash_move):
+            yield hash_move
+        else:
+            hash_move = 0
+
+        for move in self.ordered_captures(position):
+            if move != hash_move:
+                yield move
+
+        squares = position.squares
+        killers = [move for move in self.killers[ply] if move != hash_move and not squares[move & 0x7F]
+                   and position.is_pseudo_legal(move)]
+        yield from killers
+
+        history = self.history[position.side]
+        quiets = position.generate_quiets()
+        quiets.sort(key = lambda move: -history[self.moving_piece(position, move)][move & 0x7F])
+
+        for move in quiets:
+            if move != hash_move and move not in killers:
+                yield move
+
+
+    @staticmethod
+    def moving_piece(position: Position, move: int) -> int:
+        """ This function returns the piece code a move places on its destination, before any promotion. """
+
+        from_sq = move >> 7 & 0x7F
+        return from_sq - SQUARES if from_sq >= SQUARES else abs(position.squares[from_sq])
+
+
+    def record_cutoff(self, position: Position, move: int, depth: int, ply: int) -> None:
+        """ This function rewards a quiet move that caused a beta cutoff in the killer and history tables. """
+
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1:] = killers[:-1]
+            killers[0] = move
+
+        history = self.history[position.side][self.moving_piece(position, move)]
+        history[move & 0x7F] += depth * depth
+
+        if history[move & 0x7F] > HISTORY_LIMIT:
+            self.age_history()
+
+
+    def age_history(self) -> None:
+        """ This function halves every history score, so old cutoffs count for less than recent ones. """
+
+        for player_history in self.history:
+            for piece_history in player_history:
+                piece_history[:] = [score >> 1 for score in piece_history]
+
+
+    def ordered_captures(self, position: Position) -> list[int]:
+        """ This function returns the captures with the most valuable victims first, cheaper attackers breaking ties. """
+
+        moves = position.generate_captures()
+        squares = position.squares
+
+        moves.sort(key = lambda move: PIECE_VALUES[abs(squares[move >> 7 & 0x7F])]
+                   - PIECE_VALUES[abs(squares[move & 0x7F])] * 16)
+
+        return moves
+
+
+    def alpha_beta(self, position: Position, depth: int, alpha: int, beta: int, ply: int,
+                   null_allowed: bool = True) -> int:
+        """ This function returns the negamax score of a position, searched within an alpha-beta window. """
+
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and self.out_of_budget():
+            self.stopped = True
+
+        if self.stopped:
+            return 0
+
+        # Instead of stopping in the middle of an exchange, the horizon is resolved by the quiescence search
+        if depth <= 0:
+            return self.quiescence(position, alpha, beta, ply, 0)
+
+        # A stored result of at least this depth can answer the node without searching it
+        hash_move = 0
+        entry = self.tt.probe(position.key)
+
+        if entry is not None:
+            entry_depth, bound, score, hash_move = entry
+            score = score_from_tt(score, ply)
+
+            if entry_depth >= depth and (bound == EXACT or (bound == LOWER and score >= beta)
+                                         or (bound == UPPER and score <= alpha)):
+                return score
+
+        player = position.side
+        in_check = position.in_check(player)
+
+        # Null move: if passing still fails high, a real move will too. Passing is not possible in check, and with
+        # a well stocked komadai the threats of the drops make the assumption that a move always helps unsafe
+        if (self.null_move and null_allowed and not in_check and depth >= NULL_MOVE_MIN_DEPTH
+                and abs(beta) < MATE_BOUND and sum(position.hands[player]) < NULL_MOVE_HAND_LIMIT
+                and evaluate(position) >= beta):
+            position.set_side(player ^ 1)
+            score = -self.alpha_beta(position, depth - 1 - NULL_MOVE_REDUCTION, -beta, -beta + 1, ply + 1, False)
+            position.set_side(player)
+
+            if self.stopped:
+                return 0
+
+            if score >= beta:
+                return beta
+
+        original_alpha = alpha
+        best_move, best_score = 0, -INFINITE
+        killers = self.killers[ply]
+        searched = 0
+
+        for move in self.pick_moves(position, hash_move, ply):
+            undo = position.make_move(move)
+
+            if position.in_check(player):
+                position.unmake_move(undo)
+                continue
+
+            searched += 1
+
+            # The first move is expected to be best and gets the full window, the others only have to be shown worse
+            if searched == 1:
+                score = -self.alpha_beta(position, depth - 1, -beta, -alpha, ply + 1)
+
+            else:
+                reduction = 0
+
+                # Late quiet moves are also searched shallower, and again at full depth if they still beat alpha
+                if (self.late_move_reductions and depth >= LMR_MIN_DEPTH and searched > LMR_FULL_MOVES
+                        and not in_check and undo >> 16 == 0 and not move & PROMOTE_FLAG and move not in killers
+                        and not position.in_check(player ^ 1)):
+                    reduction = 2 if searched > LMR_DEEP_MOVES and depth > LMR_MIN_DEPTH else 1
+
+                score = -self.alpha_beta(position, depth - 1 - reduction, -alpha - 1, -alpha, ply + 1)
+
+                if reduction and score > alpha and not self.stopped:
+                    score = -self.alpha_beta(position, depth - 1, -alpha - 1, -alpha, ply + 1)
+
+                if alpha < score < beta and not self.stopped:
+                    score = -self.alpha_beta(position, depth - 1, -beta, -alpha, ply + 1)
+
+            position.unmake_move(undo)
+
+            if self.stopped:
+                return 0
+
+            if score > best_score:
+                best_move, best_score = move, score
+
+                if score > alpha:
+                    alpha = score
+
+                    if alpha >= beta:
+                        # Quiet moves that refute a line are remembered for the sibling positions
+                        if undo >> 16 == 0:
+                            self.record_cutoff(position, move, depth, ply)
+                        break
+
+        # With no legal move the player to move is checkmated, sooner mates score higher for the winner
+        if best_move == 0:
+            return -MATE + ply
+
+        bound = LOWER if best_score >= beta else UPPER if best_score <= original_alpha else EXACT
+        self.tt.store(position.key, depth, bound, score_to_tt(best_score, ply), best_move)
+
+        return best_score
+
+
+    def quiescence(self, position: Position, alpha: int, beta: int, ply: int, qply: int) -> int:
+        """ This function searches only captures (and optionally checks) below the horizon until the position is quiet.
+            The player to move may stand pat on the static evaluation, unless they are in check. """
+
+        self.qnodes += 1
+        if self.qnodes & 1023 == 0 and self.out_of_budget():
+            self.stopped = True
+
+        if self.stopped:
+            return 0
+
+        if ply >= MAX_PLY:
+            return evaluate(position)
+
+        player = position.side
+        in_check = position.in_check(player)
+
+        if in_check:
+            # Every evasion has to be tried, since standing still is not an option
+            stand_pat = -INFINITE
+            moves = self.pick_moves(position, 0, ply)
+
+        else:
+            stand_pat = evaluate(position)
+
+            if stand_pat >= beta:
+                return stand_pat
+
+            alpha = max(alpha, stand_pat)
+            moves = self.ordered_captures(position)
+
+            if self.quiescence_checks and qply < QUIESCENCE_CHECK_PLIES:
+                moves += position.generate_checks()
+
+        squares = position.squares
+        best_score = stand_pat
+        searched = False
+
+        for move in moves:
+            captured = PIECE_VALUES[abs(squares[move & 0x7F])] if not is_drop(move) else 0
+
+            # Delta pruning: a capture that cannot lift the score near alpha even when uncontested is skipped
+            if captured and not in_check and not move & PROMOTE_FLAG and stand_pat + captured + DELTA_MARGIN <= alpha:
+                continue
+
+            undo = position.make_move(move)
+
+            if position.in_check(player):
+                position.unmake_move(undo)
+                continue
+
+            searched = True
+            score = -self.quiescence(position, -beta, -alpha, ply + 1, qply + 1)
+            position.unmake_move(undo)
+
+            if self.stopped:
+                return 0
+
+            if score > best_score:
+                best_score = score
+
+                if score > alpha:
+                    alpha = score
+
+                    if alpha >= beta:
+                        break
+
+        # Checked with no way out is mate
+        if in_check and not searched:
+            return -MATE + ply
+
+        return best_score
@@ -0,0 +1,292 @@
+""" This is the 'transposition' module that holds the engine's transposition table. Entries live in two preallocated
+arrays of 64-bit words (keys and packed data) rather than in a dictionary of objects, so the memory use is fixed. """
+
+import weakref
+from array import array
+from multiprocessing import shared_memory
+
+
+""" BOUND TYPES. """
+EXACT, LOWER, UPPER = 1, 2, 3  # Score is exact, a lower bound (fail high) or an upper bound (fail low)
+
+""" ENTRY LAYOUT. """
+# Data word: move in bits 0-15, score + 32768 in bits 16-31, depth in bits 32-39, bound in 40-41, generation in 42-49
+SCORE_OFFSET = 32768
+ENTRY_BYTES = 16  # One key word and one data word
+BUCKET_SIZE = 2  # Slot 0 keeps the deepest search, slot 1 always takes the newest store
+
+""" SHARED TABLE HEADER. """
+# Words at the start of a shared block, ahead of the entries
+MAGIC_WORD, BUCKETS_WORD, GENERATION_WORD = range(3)
+HEADER_WORDS = 4
+TABLE_MAGIC = 0x5348_4F47_4954_5431  # Marks a block as a transposition table before another process attaches to it
+
+
+def pack_entry(move: int, score: int, depth: int, bound: int, generation: int) -> int:
+    """ This function packs an entry's fields into a single 64-bit data word. """
+
+    return move | (score + SCORE_OFFSET) << 16 | depth << 32 | bound << 40 | generation << 42
+
+
+def unpack_entry(data: int) -> tuple[int, int, int, int]:
+    """ This function unpacks a data word into its depth, bound, score and move. """
+
+    return data >> 32 & 0xFF, data >> 40 & 0x3, (data >> 16 & 0xFFFF) - SCORE_OFFSET, data & 0xFFFF
+
+
+class TranspositionTable:
+
+    def __init__(self, size_mb: int = 16) -> None:
+        # The number of buckets is the largest power of two that fits in the requested memory
+        buckets = max((size_mb << 20) // (ENTRY_BYTES * BUCKET_SIZE), 1)
+        self.buckets = 1 << (buckets.bit_length() - 1)
+        self.mask = self.buckets - 1
+
+        self.keys = array('Q', bytes(8 * self.buckets * BUCKET_SIZE))
+        self.data = array('Q', bytes(8 * self.buckets * BUCKET_SIZE))
+        self.generation = 0
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0  # Stores that overwrote the entry of another position, not true hash collisions
+
+
+    def clear(self) -> None:
+        """ This function empties every slot and resets the counters. """
+
+        self.keys = array('Q', bytes(len(self.keys) * 8))
+        self.data = array('Q', bytes(len(self.data) * 8))
+        self.generation = 0
+        self.probes = self.hits = self.stores = self.replacements = 0
+
+
+    def new_search(self) -> None:
+        """ This function ages the table between moves, so entries from earlier searches are replaced first. """
+
+        self.generation = (self.generation + 1) & 0xFF
+
+
+    def probe(self, key: int) -> tuple[int, int, int, int] | None:
+        """ This function returns the (depth, bound, score, move) stored for a key, or None if it is not in the table. """
+
+        self.probes += 1
+        idx = (key & self.mask) * BUCKET_SIZE
+        keys = self.keys
+
+        for slot in (idx, idx + 1):
+            if keys[slot] == key:
+                self.hits += 1
+                return unpack_entry(self.data[slot])
+
+        return None
+
+
+    def store(self, key: int, depth: int, bound: int, score: int, move: int) -> None:
+        """ This function saves a search result into the key's bucket. """
+
+        self.stores += 1
+        idx = (key & self.mask) * BUCKET_SIZE
+        keys, data = self.keys, self.data
+
+        # The depth preferred slot is only replaced by the same position, a deeper search or a stale entry
+        stored = data[idx]
+        if (keys[idx] == key or keys[idx] == 0 or depth >= stored >> 32 & 0xFF
+                or stored >> 42 & 0xFF != self.generation):
+            slot = idx
+        else:
+            slot = idx + 1
+
+        # Keep the previous best move when a new result for the same position has none
+        if keys[slot] == key and move == 0:
+            move = data[slot] & 0xFFFF
+
+        elif keys[slot] not in (0, key):
+            self.replacements += 1
+
+        keys[slot] = key
+        data[slot] = pack_entry(move, max(-SCORE_OFFSET, min(score, SCORE_OFFSET - 1)), depth, bound, self.generation)
+
+
+    def hashfull(self) -> int:
+        """ This function returns how many slots out of a thousand hold an entry from the current search. """
+
+        sample = min(len(self.keys), 1000)
+        used = sum(1 for slot in range(sample) if self.keys[slot] != 0 and self.data[slot] >> 42 & 0xFF == self.generation)
+
+        return used * 1000 // sample
+
+
+    def occupancy(self) -> float:
+        """ This function returns the share of slots holding an entry of any generation, counted over the whole table. """
+
+        return sum(1 for key in self.keys if key != 0) / len(self.keys)
+
+
+    def stats(self) -> dict:
+        """ This function returns the table's size and usage counters. The counters belong to this process, a shared
+            table keeps them per process so that no two processes ever write the same counter. """
+
+        return {'entries': len(self.keys), 'probes': self.probes, 'hits': self.hits,
+                'hit_rate': self.hits / self.probes if self.probes else 0.0, 'stores': self.stores,
+                'replacements': self.replacements, 'hashfull': self.hashfull(), 'occupancy': self.occupancy()}
+
+
+def release_block(shm: shared_memory.SharedMemory, views: list[memoryview], unlink: bool) -> None:
+    """ This function releases a shared table's views into its block before closing the block, which fails while any
+        view is still exported, and frees the block if the table created it. """
+
+    for view in views:
+        view.release()
+
+    shm.close()
+
+    if unlink:
+        shm.unlink()
+
+
+class SharedTranspositionTable(TranspositionTable):
+
+    def __init__(self, size_mb: int = 16, name: str = None) -> None:
+        """ This function creates a table in a new shared memory block, or attaches to the existing block called name.
+            An attached table reads its size from the block's header, so the name is all another process needs. """
+
+        self.owner = name is None
+
+        if self.owner:
+            buckets = max((size_mb << 20) // (ENTRY_BYTES * BUCKET_SIZE), 1)
+            buckets = 1 << (buckets.bit_length() - 1)
+            self.shm = shared_memory.SharedMemory(create = True, size = 8 * HEADER_WORDS + ENTRY_BYTES * BUCKET_SIZE * buckets)
+
+        else:
+            self.shm = shared_memory.SharedMemory(name = name)
+
+        self.name = self.shm.name
+        words = self.shm.buf.cast('Q')
+        self.header = words[:HEADER_WORDS]
+
+        if self.owner:
+            self.header[MAGIC_WORD], self.header[BUCKETS_WORD] = TABLE_MAGIC, buckets
+
+        elif self.header[MAGIC_WORD] != TABLE_MAGIC:
+            self.header.release()
+            words.release()
+            self.shm.close()
+            raise ValueError(f'shared memory block {name} does not hold a transposition table')
+
+        self.buckets = self.header[BUCKETS_WORD]
+        self.mask = self.buckets - 1
+
+        # Entries are packed as fixed width pairs of words, the key xor data followed by the data
+        slots = self.buckets * BUCKET_SIZE
+        self.keys = words[HEADER_WORDS:HEADER_WORDS + 2 * slots:2]
+        self.data = words[HEADER_WORDS + 1:HEADER_WORDS + 2 * slots:2]
+        words.release()
+
+        # A table that is never closed still releases its block when it is collected or the interpreter exits
+        self.finalizer = weakref.finalize(self, release_block, self.shm, [self.header, self.keys, self.data], self.owner)
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedTranspositionTable':
+        """ This function attaches to the table another process created under name. """
+
+        return cls(name = name)
+
+
+    @property
+    def generation(self) -> int:
+        """ This function returns the generation kept in the shared header, so every process ages entries alike. """
+
+        return self.header[GENERATION_WORD]
+
+
+    def clear(self) -> None:
+        """ This function empties every slot in the shared block and resets the counters, the layout is kept. """
+
+        self.keys[:] = array('Q', bytes(8 * len(self.keys)))
+        self.data[:] = array('Q', bytes(8 * len(self.data)))
+
+        self.header[GENERATION_WORD] = 0
+        self.probes = self.hits = self.stores = self.replacements = 0
+
+
+    def new_search(self) -> None:
+        """ This function ages the table, which only the creating process does, the others follow its header. """
+
+        if self.owner:
+            self.header[GENERATION_WORD] = (self.header[GENERATION_WORD] + 1) & 0xFF
+
+
+    def probe(self, key: int) -> tuple[int, int, int, int] | None:
+        """ This function returns the (depth, bound, score, move) stored for a key, or None if it is not in the table.
+            A slot only matches if its key word xor its data word gives the key, so a half written entry never does. """
+
+        self.probes += 1
+        idx = (key & self.mask) * BUCKET_SIZE
+        keys, data = self.keys, self.data
+
+        for slot in (idx, idx + 1):
+            stored = data[slot]
+
+            if keys[slot] ^ stored == key:
+                self.hits += 1
+                return unpack_entry(stored)
+
+        return None
+
+
+    def store(self, key: int, depth: int, bound: int, score: int, move: int) -> None:
+        """ This function saves a search result into the key's bucket without taking a lock. Both words of the entry
+            are written together with the key folded into the first, so a write torn by another process only costs
+            an entry, it can never be read back as a wrong result. """
+
+        self.stores += 1
+        idx = (key & self.mask) * BUCKET_SIZE
+        keys, data = self.keys, self.data
+        generation = self.header[GENERATION_WORD]
+
+        stored = data[idx]
+        stored_key = keys[idx] ^ stored
+        if (stored_key == key or keys[idx] == 0 or depth >= stored >> 32 & 0xFF
+                or stored >> 42 & 0xFF != generation):
+            slot = idx
+        else:
+            slot = idx + 1
+
+        stored = data[slot]
+        stored_key = keys[slot] ^ stored
+
+        if stored_key == key and move == 0:
+            move = stored & 0xFFFF
+
+        elif keys[slot] != 0 and stored_key != key:
+            self.replacements += 1
+
+        entry = pack_entry(move, max(-SCORE_OFFSET, min(score, SCORE_OFFSET - 1)), depth, bound, generation)
+        keys[slot] = key ^ entry
+        data[slot] = entry
+
+
+    def close(self) -> None:
+        """ This function detaches from the shared block, and frees it if this process created it. Closing a table
+            again does nothing. """
+
+        self.finalizer()
+
+
+    def __enter__(self) -> 'SharedTranspositionTable':
+        """ This function lets a table be used in a with block, which closes it on the way out. """
+
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        """ This function closes the table at the end of a with block. """
+
+        self.close()
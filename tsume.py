@@ -0,0 +1,358 @@
+""" This is the 'tsume' module that holds the mate solver. It runs a depth-first proof-number search (df-pn), where the
+attacker may only play checks and the defender every evasion, drop interpositions included, to prove or disprove a
+forced mate and return the mating sequence. Once a mate is proven it is shortened to the minimal line, the shortest
+attack against the longest defence, by proving mates within ply bounds. """
+
+import time
+
+from constants import *
+from bitboards import attacks_from
+from position import Position, usi_notation
+
+
+""" PROOF NUMBERS. """
+INFINITY = 100_000_000  # Proof or disproof number of a solved node
+TABLE_ENTRIES = 1 << 19  # Entries the proof table may hold before its least searched entries are collected
+COLLECT_SHARE = 0.5  # Share of the entries kept by a garbage collection, the ones that took the most work
+TSUME_MAX_PLY = 127  # Plies beyond which a line is treated as not mating
+
+
+class TsumeSolver:
+
+    def __init__(self, max_entries: int = TABLE_ENTRIES, max_nodes: int = None, time_limit: float = None) -> None:
+        self.table = {}  # Zobrist key, or (key, plies left) in a bounded search -> (proof, disproof, work, mate length)
+        self.max_entries = max_entries
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+
+        self.attacker = SENTE
+        self.depth_limit = None  # Ply bound of the search being run, None when unbounded
+        self.path = set()  # Keys of the positions on the current line, a repetition never counts as mate
+        self.nodes = 0
+        self.collections = 0
+        self.deadline = None
+        self.stopped = False
+        self.status = ''  # 'mate', 'no mate' or 'unknown' once solve has run
+        self.minimal = False  # True once a returned mate has been shortened to the minimal line
+
+
+    def solve(self, position: Position) -> list[int] | None:
+        """ This function tries to prove that the player to move can force mate and returns the minimal mating
+            sequence. If the budget runs out while the mate is being shortened, the first sequence found is returned
+            instead (see minimal). None is returned if there is no mate, or if the budget ran out before one was
+            proven (see status). """
+
+        self.table.clear()
+        self.path.clear()
+        self.attacker = position.side
+        self.depth_limit = None
+        self.minimal = False
+        self.nodes = 0
+        self.collections = 0
+        self.stopped = False
+        self.deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+
+        self.mid(position, INFINITY - 1, INFINITY - 1, 0)
+        proof, disproof = self.lookup(position.key, 0)[:2]
+
+        if proof == 0:
+            self.status = 'mate'
+            sequence = self.mating_sequence(position)
+            minimal = self.minimal_sequence(position, len(sequence))
+            self.minimal = minimal is not None
+
+            return minimal if minimal is not None else sequence
+
+        self.status = 'no mate' if disproof == 0 else 'unknown'
+        return None
+
+
+    def solve_board(self, board: list, captured_pieces: dict, current_player: str = 'sente') -> list[str] | None:
+        """ This function solves the position of a board array and its komadai counts, as held by GameMechanics, and
+            returns the mating sequence in USI notation. """
+
+        sequence = self.solve(Position.from_board(board, captured_pieces, current_player))
+        return [usi_notation(move) for move in sequence] if sequence is not None else None
+
+
+    def out_of_budget(self) -> bool:
+        """ This function returns True once the node or time budget has been used up. """
+
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            return True
+
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+
+    def attacker_moves(self, position: Position) -> list[int]:
+        """ This function returns the legal moves of the attacker that check the defending king. """
+
+        player = position.side
+        king_sq = position.king_squares[player ^ 1]
+        if king_sq is None:
+            return []
+
+        discoverers = position.discoverers(player)
+
+        # Drops only check from the squares the hand's pieces would attack the king from
+        drop_filter = 0
+        for piece in HAND_TYPES:
+            if position.hands[player][piece]:
+                drop_filter |= attacks_from(player ^ 1, piece, king_sq, position.lines)
+
+        # The generator already leaves out a pawn drop that would mate (uchifuzume)
+        return [move for move in position.generate_legal(drop_filter) if position.gives_check(move, discoverers)]
+
+
+    def node_moves(self, position: Position) -> list[int]:
+        """ This function returns the checks at an attacker node, or every legal evasion at a defender node. """
+
+        return self.attacker_moves(position) if position.side == self.attacker else position.generate_legal()
+
+
+    def entry_key(self, key: int, ply: int) -> int | tuple[int, int]:
+        """ This function returns the table key of a position. In a bounded search a proof only holds for the plies
+            left, so those are part of the key, and the entries stay valid from any root and bound. """
+
+        return key if self.depth_limit is None else (key, self.depth_limit - ply)
+
+
+    def lookup(self, key: int, ply: int) -> tuple[int, int, int, int]:
+        """ This function returns the stored (proof, disproof, work, length) of a position, with unseen positions at
+            (1, 1). A repetition on the current line or a line past the ply limit is never a mate. """
+
+        if key in self.path or ply > (TSUME_MAX_PLY if self.depth_limit is None else self.depth_limit):
+            return INFINITY, 0, 0, 0
+
+        return self.table.get(self.entry_key(key, ply), (1, 1, 0, 0))
+
+
+    def store(self, key: int, ply: int, proof: int, disproof: int, work: int, length: int) -> None:
+        """ This function saves a position's numbers, collecting the table first if it is full. """
+
+        entry_key = self.entry_key(key, ply)
+        if len(self.table) >= self.max_entries and entry_key not in self.table:
+            self.collect()
+
+        self.table[entry_key] = (proof, disproof, work, length)
+
+
+    def collect(self) -> None:
+        """ This function frees the table by dropping the entries that took the least work to find. """
+
+        # Most leaves took the same single node of work, so exactly the share to keep is taken rather than a cut-off
+        keep = int(len(self.table) * COLLECT_SHARE)
+        self.table = dict(sorted(self.table.items(), key = lambda item: item[1][2], reverse = True)[:keep])
+        self.collections += 1
+
+
+    def mid(self, position: Position, phi_threshold: int, delta_threshold: int, ply: int) -> None:
+        """ This function expands a node until its proof or disproof number reaches a threshold. Numbers are handled
+            as (phi, delta): (proof, disproof) at an attacker node and (disproof, proof) at a defender node, so both
+            node types share one rule. The result is left in the table. """
+
+        key = position.key
+        or_node = position.side == self.attacker
+
+        proof, disproof = self.lookup(key, ply)[:2]
+        phi, delta = (proof, disproof) if or_node else (disproof, proof)
+        if phi >= phi_threshold or delta >= delta_threshold:
+            return
+
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and self.out_of_budget():
+            self.stopped = True
+
+        if self.stopped:
+            return
+
+        moves = self.node_moves(position)
+        work_started = self.nodes
+
+        # No check is a disproof, no evasion is mate
+        if not moves:
+            self.store(key, ply, INFINITY, 0, 1, 0) if or_node else self.store(key, ply, 0, INFINITY, 1, 0)
+            return
+
+        child_keys = [position.key_after(move) for move in moves]
+        self.path.add(key)
+
+        while True:
+            children = [self.lookup(child_key, ply + 1) for child_key in child_keys]
+
+            # A child's phi is the parent's delta contribution and its delta the parent's phi candidate
+            child_phis = [entry[1] if or_node else entry[0] for entry in children]
+            child_deltas = [entry[0] if or_node else entry[1] for entry in children]
+
+            # Drops reach the same positions through many lines, so a plain sum would count shared subtrees again and
+            # again. The largest child number plus one for every other unsolved child keeps the numbers bounded
+            phi = min(child_deltas)
+            unsolved = [value for value in child_phis if value]
+
+            if INFINITY in child_phis:
+                delta = INFINITY
+            else:
+                delta = min(max(unsolved) + len(unsolved) - 1, INFINITY - 1) if unsolved else 0
+
+            if phi >= phi_threshold or delta >= delta_threshold or self.stopped:
+                break
+
+            best = min(range(len(moves)), key = lambda idx: child_deltas[idx])
+            second = min((child_deltas[idx] for idx in range(len(moves)) if idx != best), default = INFINITY)
+
+            undo = position.make_move(moves[best])
+            self.mid(position, delta_threshold + child_phis[best] - delta, min(phi_threshold, second + 1), ply + 1)
+            position.unmake_move(undo)
+
+        self.path.discard(key)
+
+        # The length of the proof found is kept for solved nodes, an upper bound for the minimal sequence
+        length = 0
+        proven = [entry[3] for entry in children if entry[0] == 0]
+
+        if or_node and proven:
+            length = 1 + min(proven)
+
+        elif not or_node and len(proven) == len(children):
+            length = 1 + max(proven)
+
+        proof, disproof = (phi, delta) if or_node else (delta, phi)
+        self.store(key, ply, proof, disproof, self.nodes - work_started + 1, length)
+
+
+    def mate_within(self, position: Position, plies: int) -> bool | None:
+        """ This function returns whether the attacker forces mate from a position within a number of plies, or None
+            if the budget runs out first. """
+
+        self.depth_limit = plies
+        self.path.clear()
+
+        self.mid(position, INFINITY - 1, INFINITY - 1, 0)
+        proof, disproof = self.lookup(position.key, 0)[:2]
+        self.depth_limit = None
+
+        if proof == 0:
+            return True
+
+        return False if disproof == 0 else None
+
+
+    def minimal_sequence(self, position: Position, upper_bound: int) -> list[int] | None:
+        """ This function returns the minimal mating sequence of a proven position, the attacker mating as fast as
+            possible and the defender holding out as long as possible, or None if the budget runs out first. The
+            mate length is found by trying ply bounds from one upwards, below the length of the proof already found. """
+
+        length = upper_bound
+        for plies in range(1, upper_bound, 2):
+            found = self.mate_within(position, plies)
+            if found is None:
+                return None
+
+            if found:
+                length = plies
+                break
+
+        sequence, undos = [], []
+
+        while len(sequence) < length:
+            remaining = length - len(sequence)
+            or_node = position.side == self.attacker
+            chosen = 0
+
+            # Children the bounded searches have already solved come first, so most of them need no search at all
+            bound = remaining - 1 if or_node else remaining - 3
+            moves = sorted(self.node_moves(position), key = lambda move:
+                           self.table.get((position.key_after(move), bound), (1, 1))[0 if or_node else 1])
+
+            for move in moves:
+                undo = position.make_move(move)
+
+                # The attacker takes any check that still mates in time, the defender an evasion that is not mated
+                # two plies sooner than the bound
+                if or_node:
+                    found = self.mate_within(position, remaining - 1)
+                elif remaining < 3:
+                    found = True
+                else:
+                    sooner = self.mate_within(position, remaining - 3)
+                    found = None if sooner is None else not sooner
+
+                position.unmake_move(undo)
+
+                if found is None or self.stopped:
+                    break
+
+                if found:
+                    chosen = move
+                    break
+
+            if chosen == 0:
+                sequence = None
+                break
+
+            sequence.append(chosen)
+            undos.append(position.make_move(chosen))
+
+        for undo in reversed(undos):
+            position.unmake_move(undo)
+
+        return sequence
+
+
+    def mating_sequence(self, position: Position) -> list[int]:
+        """ This function follows a proven position down the table: the attacker takes the proven check with the
+            shortest stored proof and the defender the evasion with the longest. These are the proofs df-pn happened
+            to find, so the sequence is a mate but not necessarily the minimal one. """
+
+        sequence, undos = [], []
+
+        while len(sequence) <= TSUME_MAX_PLY and not self.stopped:
+            or_node = position.side == self.attacker
+            moves = self.node_moves(position)
+            if not moves:
+                break
+
+            move = self.proven_move(position, moves, or_node, len(sequence))
+            if move == 0:
+                move = self.proven_move(position, moves, or_node, len(sequence), prove_missing = True)
+
+            if move == 0:
+                break
+
+            sequence.append(move)
+            undos.append(position.make_move(move))
+
+        for undo in reversed(undos):
+            position.unmake_move(undo)
+
+        return sequence
+
+
+    def proven_move(self, position: Position, moves: list[int], or_node: bool, ply: int,
+                    prove_missing: bool = False) -> int:
+        """ This function picks the next move of the mating sequence from the table, or 0 if the table lacks it. Children
+            dropped by garbage collection can be proved again one by one, as each is stored last when it is solved. """
+
+        best_move, best_length = 0, None
+
+        for move in moves:
+            undo = position.make_move(move)
+            entry = self.table.get(self.entry_key(position.key, ply + 1))
+
+            if entry is None and prove_missing:
+                self.path.clear()
+                self.mid(position, INFINITY - 1, INFINITY - 1, ply + 1)
+                entry = self.table.get(self.entry_key(position.key, ply + 1))
+
+            position.unmake_move(undo)
+
+            # At a defender node every evasion must be proven
+            if entry is None or entry[0] != 0:
+                if not or_node:
+                    return 0
+                continue
+
+            if best_length is None or (entry[3] < best_length if or_node else entry[3] > best_length):
+                best_move, best_length = move, entry[3]
+
+        return best_move